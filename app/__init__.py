@@ -25,6 +25,12 @@ def create_app(config_name=None):
     jwt.init_app(app)
     CORS(app)
     
+    from app.utils.view_counter import view_counter
+    view_counter.init_app(app)
+    
+    from app.utils.cache import cache
+    cache.init_app(app)
+    
     # Setup logging
     from app.middleware.logging_middleware import setup_logging, log_request, log_response
     setup_logging(app)
@@ -35,6 +41,10 @@ def create_app(config_name=None):
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
     
+    # Register CLI commands
+    from app.utils.commands import register_commands
+    register_commands(app)
+    
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.admin import admin_bp
@@ -15,6 +15,7 @@ from app.models.comment import Comment
 from app.models.subscription import Subscription
 from app.models.wishlist import Wishlist
 from app.models.content_review import ContentReview
+from app.models.content_neighbor import ContentNeighbor
 
 # Exported symbols
 __all__ = [
@@ -26,4 +27,5 @@ __all__ = [
     "Subscription",
     "Wishlist",
     "ContentReview",
+    "ContentNeighbor",
 ]
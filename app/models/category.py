@@ -10,10 +10,11 @@ class Category(db.Model):
     slug = db.Column(db.String(100), unique=True, nullable=False, index=True)
     
     # Track who created the category
-    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Also touched when content_count changes (content_category_touch_trigger)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -32,6 +33,33 @@ class Category(db.Model):
         """Generate URL-friendly slug from name"""
         return name.lower().replace(' ', '-').replace('_', '-')
     
+    @staticmethod
+    def validators(category_id=None):
+        """
+        Conditional GET validators for one category or the category list
+        
+        content_count is part of the representation. Adding, deleting or
+        moving content touches its category's updated_at (see
+        content_category_touch_trigger), so the category rows alone are the
+        watermark and no content rows are counted. There is no Last-Modified,
+        since deleting a category leaves no row to carry a newer timestamp.
+        
+        Returns:
+            tuple: (etag, None), or None if the category does not exist
+        """
+        from app.utils.conditional import make_etag
+        
+        categories = db.session.query(db.func.count(Category.id), db.func.max(Category.updated_at))
+        if category_id is not None:
+            categories = categories.filter(Category.id == category_id)
+        
+        category_total, category_updated = categories.one()
+        if category_id is not None and not category_total:
+            return None
+        
+        etag = make_etag('categories', category_id, category_total, category_updated)
+        return etag, None
+    
     def to_dict(self):
         """Convert category object to dictionary"""
         return {
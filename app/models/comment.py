@@ -1,6 +1,30 @@
 from app import db
 from datetime import datetime
 
+# Materialized path: the zero-padded ids from the thread root down to the
+# comment, e.g. '0000000012.0000000034'. Fixed-width segments make byte order
+# (collation "C") match tree order, so a subtree is one contiguous index range.
+PATH_SEGMENT_WIDTH = 10
+PATH_SEPARATOR = '.'
+
+COMMENT_PATH_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION comments_path_insert() RETURNS trigger AS $$
+BEGIN
+    NEW.path := lpad(NEW.id::text, 10, '0');
+    IF NEW.parent_comment_id IS NOT NULL THEN
+        NEW.path := (SELECT path FROM comments WHERE id = NEW.parent_comment_id) || '.' || NEW.path;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+COMMENT_PATH_TRIGGER_DDL = """
+CREATE TRIGGER comments_path_trigger
+BEFORE INSERT ON comments
+FOR EACH ROW EXECUTE FUNCTION comments_path_insert()
+"""
+
 class Comment(db.Model):
     __tablename__ = 'comments'
     
@@ -8,9 +32,15 @@ class Comment(db.Model):
     comment_text = db.Column(db.Text, nullable=False)
     
     # Foreign keys
-    content_id = db.Column(db.Integer, db.ForeignKey('content.id'), nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comments.id'), nullable=True, index=True)
+    content_id = db.Column(db.Integer, db.ForeignKey('content.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    parent_comment_id = db.Column(db.Integer, db.ForeignKey('comments.id', ondelete='CASCADE'), nullable=True)
+    
+    # Set by comments_path_trigger on insert; a comment never changes parent
+    path = db.Column(db.Text(collation='C'), nullable=False, server_default=db.FetchedValue())
+    
+    # Denormalized number of direct replies
+    replies_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -20,12 +50,23 @@ class Comment(db.Model):
     content = db.relationship('Content', back_populates='comments')
     user = db.relationship('User', back_populates='comments')
     
-    # Self-referential relationship for threading
+    # Self-referential relationship for threading. Replies are removed by the
+    # database (ON DELETE CASCADE) or delete_subtree, never loaded to delete.
     replies = db.relationship(
         'Comment',
         backref=db.backref('parent', remote_side=[id]),
         lazy='dynamic',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    
+    __table_args__ = (
+        # Thread order, subtrees and depth-limited fetches are range scans
+        db.Index('ix_comments_content_path', 'content_id', 'path'),
+        # Newest-first pages of top-level comments and of each comment's replies
+        db.Index('ix_comments_content_root_created', 'content_id', 'created_at', 'id',
+                 postgresql_where=db.text('parent_comment_id IS NULL')),
+        db.Index('ix_comments_parent_created', 'parent_comment_id', 'created_at', 'id'),
     )
     
     def __init__(self, comment_text, content_id, user_id, parent_comment_id=None):
@@ -47,7 +88,7 @@ class Comment(db.Model):
             'parent_comment_id': self.parent_comment_id,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'replies_count': self.replies.count()
+            'replies_count': self.replies_count
         }
         
         # Include nested replies if requested and not exceeding max depth
@@ -59,13 +100,244 @@ class Comment(db.Model):
         
         return data
     
+    @staticmethod
+    def get_thread_page(content_id, cursor=None, per_page=20, replies_per_parent=3, max_depth=3):
+        """
+        Load a page of top-level comments with capped replies under each
+        
+        Two queries however large the thread: the keyset page of top-level
+        comments, then their reply branches (see get_reply_tree).
+        
+        Args:
+            content_id: ID of the content
+            cursor: Cursor from a previous page, or None for the newest comments
+            per_page: Number of top-level comments
+            replies_per_parent: Newest replies shown under each comment
+            max_depth: Reply levels to include below top-level comments
+        
+        Returns:
+            dict: Nested comments and cursors for the neighbouring pages
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        from app.utils.pagination import keyset_paginate
+        
+        query = Comment.query.options(db.joinedload(Comment.user))\
+            .filter_by(content_id=content_id, parent_comment_id=None)
+        page = keyset_paginate(query, Comment.created_at, Comment.id, cursor=cursor, per_page=per_page)
+        
+        return {
+            'comments': Comment.get_reply_tree(page['items'], replies_per_parent, max_depth),
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor'],
+            'has_more': page['has_next']
+        }
+    
+    def get_replies_page(self, cursor=None, per_page=20, replies_per_parent=3, max_depth=2):
+        """
+        Load more direct replies of this comment, continuing a replies_cursor
+        
+        Same shape and query bound as get_thread_page, one level down.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        from app.utils.pagination import keyset_paginate
+        
+        query = Comment.query.options(db.joinedload(Comment.user))\
+            .filter_by(parent_comment_id=self.id)
+        page = keyset_paginate(query, Comment.created_at, Comment.id, cursor=cursor, per_page=per_page)
+        
+        return {
+            'replies': Comment.get_reply_tree(page['items'], replies_per_parent, max_depth),
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor'],
+            'has_more': page['has_next']
+        }
+    
+    @staticmethod
+    def get_reply_tree(parents, replies_per_parent=3, max_depth=3):
+        """
+        Serialize comments with up to replies_per_parent newest replies each
+        
+        All branches come from one recursive query. Its recursive term takes
+        replies_per_parent + 1 children of every expanded comment through a
+        LATERAL ... LIMIT on the (parent_comment_id, created_at, id) index, so
+        the rows read are bounded by the caps rather than the thread size. The
+        extra child only signals that a branch continues; it is not expanded.
+        
+        Comments whose branch was cut get a replies_cursor for
+        GET /comments/<id>/replies. As in to_dict, comments max_depth levels
+        down carry no replies key.
+        
+        Args:
+            parents: Comments to serialize, in display order
+            replies_per_parent: Newest replies shown under each comment (at least 1)
+            max_depth: Reply levels to include below the parents
+        
+        Returns:
+            list: Nested comment dicts
+        """
+        from app.utils.pagination import encode_cursor
+        
+        rows = []
+        if parents and max_depth > 0:
+            branch = db.select(
+                Comment.id, db.literal(0).label('depth'), db.cast(1, db.BigInteger).label('rank')
+            ).where(Comment.id.in_([parent.id for parent in parents]))\
+                .cte(name='branch', recursive=True)
+            
+            reply = db.aliased(Comment, name='reply')
+            newest_first = (reply.created_at.desc(), reply.id.desc())
+            children = db.select(reply.id, db.func.row_number().over(order_by=newest_first).label('rank'))\
+                .where(reply.parent_comment_id == branch.c.id)\
+                .order_by(*newest_first)\
+                .limit(replies_per_parent + 1)\
+                .lateral('children')
+            
+            branch = branch.union_all(
+                db.select(children.c.id, branch.c.depth + 1, children.c.rank)
+                .select_from(branch)
+                .join(children, db.true())
+                .where(branch.c.depth < max_depth, branch.c.rank <= replies_per_parent)
+            )
+            
+            rows = db.session.query(Comment, branch.c.rank)\
+                .options(db.joinedload(Comment.user))\
+                .join(branch, Comment.id == branch.c.id)\
+                .filter(branch.c.depth > 0)\
+                .order_by(Comment.created_at.desc(), Comment.id.desc())\
+                .all()
+        
+        children_of = {}
+        for comment, rank in rows:
+            children_of.setdefault(comment.parent_comment_id, []).append((comment, rank))
+        
+        def serialize(comment, depth):
+            data = comment.to_dict(include_replies=False)
+            if depth < max_depth:
+                replies = children_of.get(comment.id, [])
+                shown = [reply for reply, rank in replies if rank <= replies_per_parent]
+                data['replies'] = [serialize(reply, depth + 1) for reply in shown]
+                data['replies_cursor'] = None
+                if len(replies) > len(shown):
+                    data['replies_cursor'] = encode_cursor(shown[-1].created_at, shown[-1].id)
+            return data
+        
+        return [serialize(parent, 0) for parent in parents]
+    
+    @property
+    def depth(self):
+        """Levels below the top-level comment of the thread (0 for top-level comments)"""
+        return self.path.count(PATH_SEPARATOR)
+    
+    @staticmethod
+    def subtree_range(path, include_self=False):
+        """Filter for the descendants of the comment at path: one index range"""
+        # '/' is the byte after the separator, so this is every path under 'path.'.
+        # Nothing sorts between path and 'path.', as digits come after '.'.
+        if include_self:
+            return db.and_(Comment.path >= path, Comment.path < path + '/')
+        return db.and_(Comment.path > path + PATH_SEPARATOR, Comment.path < path + '/')
+    
+    @staticmethod
+    def max_path_length(path, max_depth):
+        """Filter for paths at most max_depth levels below path"""
+        return db.func.length(Comment.path) <= len(path) + max_depth * (PATH_SEGMENT_WIDTH + 1)
+    
+    def descendants(self, max_depth=None):
+        """
+        Query for the replies below this comment, in thread order
+        
+        Args:
+            max_depth: Only include replies up to this many levels down
+        
+        Returns:
+            Query: Descendants ordered depth-first, oldest sibling first
+        """
+        query = Comment.query.filter(
+            Comment.content_id == self.content_id,
+            Comment.subtree_range(self.path)
+        )
+        if max_depth is not None:
+            query = query.filter(Comment.max_path_length(self.path, max_depth))
+        return query.order_by(Comment.path)
+    
+    def increment_counters(self):
+        """Count a newly created comment on its content and parent"""
+        from app.models.content import Content
+        
+        Content.query.filter_by(id=self.content_id)\
+            .update({Content.comments_count: Content.comments_count + 1}, synchronize_session=False)
+        
+        if self.parent_comment_id:
+            Comment.query.filter_by(id=self.parent_comment_id)\
+                .update({Comment.replies_count: Comment.replies_count + 1}, synchronize_session=False)
+    
+    def delete_subtree(self):
+        """
+        Delete this comment and all of its replies, and uncount them
+        
+        One DELETE over the comment's path range instead of loading and
+        deleting each reply through the ORM. Runs in the caller's transaction;
+        the comment must not be used afterwards.
+        
+        Returns:
+            int: Number of comments removed
+        """
+        from app.models.content import Content
+        
+        removed = Comment.query.filter(
+            Comment.content_id == self.content_id,
+            Comment.subtree_range(self.path, include_self=True)
+        ).delete(synchronize_session=False)
+        
+        Content.query.filter_by(id=self.content_id)\
+            .update({Content.comments_count: Content.comments_count - removed}, synchronize_session=False)
+        
+        if self.parent_comment_id:
+            Comment.query.filter_by(id=self.parent_comment_id)\
+                .update({Comment.replies_count: Comment.replies_count - 1}, synchronize_session=False)
+        
+        db.session.expunge(self)
+        return removed
+    
+    def get_subtree_ids(self):
+        """Get ids of this comment and all of its descendants in one range scan"""
+        return [row.id for row in Comment.query.with_entities(Comment.id).filter(
+            Comment.content_id == self.content_id,
+            Comment.subtree_range(self.path, include_self=True)
+        ).order_by(Comment.path).all()]
+    
+    @staticmethod
+    def recount_replies():
+        """Recompute replies_count for all comments in one statement"""
+        reply = db.aliased(Comment)
+        actual = db.select(db.func.count(reply.id))\
+            .where(reply.parent_comment_id == Comment.id)\
+            .scalar_subquery()
+        
+        fixed = Comment.query.filter(Comment.replies_count != actual)\
+            .update({Comment.replies_count: actual}, synchronize_session=False)
+        db.session.commit()
+        return fixed
+    
     def get_all_replies_recursive(self):
-        """Get all replies recursively (flattened list)"""
-        replies = []
-        for reply in self.replies.all():
-            replies.append(reply)
-            replies.extend(reply.get_all_replies_recursive())
-        return replies
+        """Get all replies recursively (flattened list, depth-first)"""
+        return self.descendants().options(db.joinedload(Comment.user)).all()
     
     def __repr__(self):
-        return f'<Comment {self.id} by User {self.user_id}>'
\ No newline at end of file
+        return f'<Comment {self.id} by User {self.user_id}>'
+
+
+db.event.listen(
+    Comment.__table__,
+    'after_create',
+    db.DDL(COMMENT_PATH_FUNCTION_DDL).execute_if(dialect='postgresql')
+)
+db.event.listen(
+    Comment.__table__,
+    'after_create',
+    db.DDL(COMMENT_PATH_TRIGGER_DDL).execute_if(dialect='postgresql')
+)
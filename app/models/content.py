@@ -1,5 +1,84 @@
+import json
 from app import db
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+
+# Keeps Content.search_vector in sync with the searchable columns. Weights rank
+# title matches above tags, description and body.
+SEARCH_VECTOR_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION content_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.body, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER_DDL = """
+CREATE TRIGGER content_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, body, tags ON content
+FOR EACH ROW EXECUTE FUNCTION content_search_vector_update()
+"""
+
+# A category's content_count changes whenever content is added to, removed
+# from or moved out of it. Touching categories.updated_at then lets the
+# listing and category validators see hard deletes without counting rows.
+CATEGORY_TOUCH_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION content_category_touch() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.category_id = NEW.category_id THEN
+        RETURN NULL;
+    END IF;
+    UPDATE categories SET updated_at = clock_timestamp() AT TIME ZONE 'utc'
+    WHERE id IN (
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.category_id END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.category_id END
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CATEGORY_TOUCH_TRIGGER_DDL = """
+CREATE TRIGGER content_category_touch_trigger
+AFTER INSERT OR DELETE OR UPDATE OF category_id ON content
+FOR EACH ROW EXECUTE FUNCTION content_category_touch()
+"""
+
+TAG_COUNTS_CACHE_KEY = 'tag-counts'
+
+# Hot ranking: each order of magnitude of popularity is worth HOT_DECAY_SECONDS
+# of recency, so newer items overtake older ones without rescoring old rows.
+HOT_EPOCH = 1704067200  # 2024-01-01T00:00:00Z
+HOT_DECAY_SECONDS = 45000
+VIEWS_PER_VOTE = 20  # views that count as much as one like
+TOP_WEEK_DAYS = 7
+
+# Fields a listing can be narrowed to with ?fields=, and the column each needs
+SPARSE_FIELDS = {
+    'title': 'title',
+    'content_type': 'content_type',
+    'content_url': 'content_url',
+    'description': 'description',
+    'thumbnail_url': 'thumbnail_url',
+    'status': 'status',
+    'flag_reason': 'flag_reason',
+    'tags': 'tags',
+    'author': 'author_id',
+    'category': 'category_id',
+    'views_count': 'views_count',
+    'likes_count': 'likes_count',
+    'dislikes_count': 'dislikes_count',
+    'comments_count': 'comments_count',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'published_at': 'published_at',
+    'approved_by': 'approved_by'
+}
 
 class Content(db.Model):
     __tablename__ = 'content'
@@ -15,19 +94,31 @@ class Content(db.Model):
     # Status management
     status = db.Column(db.String(20), default='pending', nullable=False)  # draft, pending, approved, flagged, removed
     flag_reason = db.Column(db.Text)  # Reason for flagging
-    tags = db.Column(db.ARRAY(db.String), default=[])
+    tags = db.Column(ARRAY(db.String), default=[])
+
+    # Full-text search document, maintained by content_search_vector_trigger
+    search_vector = db.deferred(db.Column(TSVECTOR))
 
     # Foreign keys
-    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    # Indexed by ix_content_category_updated
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
-    approved_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    approved_by = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
 
     # Metrics
     views_count = db.Column(db.Integer, default=0)
     likes_count = db.Column(db.Integer, default=0)
     dislikes_count = db.Column(db.Integer, default=0)
+    comments_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Ranking scores, maintained by Content.refresh_scores (flask refresh-scores)
+    hot_score = db.Column(db.Float, default=0, server_default='0', nullable=False)
+    week_score = db.Column(db.Float)  # NULL unless approved and published within TOP_WEEK_DAYS
+    scored_at = db.Column(db.DateTime, index=True)  # last time refresh_scores rewrote the scores
 
-    # Timestamps
+    # Timestamps. updated_at is the last change of anything in to_dict() other
+    # than views_count and the scores: edits, moderation and the like, dislike
+    # and comment counters all move it, so it is not "last edited by the author"
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     published_at = db.Column(db.DateTime)
@@ -36,9 +127,38 @@ class Content(db.Model):
     author = db.relationship('User', foreign_keys=[author_id], back_populates='content')
     approver = db.relationship('User', foreign_keys=[approved_by], back_populates='approved_content')
     category = db.relationship('Category', back_populates='content')
-    comments = db.relationship('Comment', back_populates='content', lazy='dynamic', cascade='all, delete-orphan')
-    reviews = db.relationship('ContentReview', back_populates='content', lazy='dynamic', cascade='all, delete-orphan')
-    wishlists = db.relationship('Wishlist', back_populates='content', lazy='dynamic', cascade='all, delete-orphan')
+    # Dependent rows go with the content through ON DELETE CASCADE; the ORM
+    # must not load them one by one on delete
+    comments = db.relationship('Comment', back_populates='content', lazy='dynamic',
+                               cascade='all, delete-orphan', passive_deletes=True)
+    reviews = db.relationship('ContentReview', back_populates='content', lazy='dynamic',
+                              cascade='all, delete-orphan', passive_deletes=True)
+    wishlists = db.relationship('Wishlist', back_populates='content', lazy='dynamic',
+                                cascade='all, delete-orphan', passive_deletes=True)
+
+    # Partial indexes matching the public feed, recommendations and the
+    # moderation queue. Backward scans serve the DESC orderings.
+    __table_args__ = (
+        db.Index('ix_content_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_content_tags', 'tags', postgresql_using='gin'),
+        db.Index('ix_content_approved_published', 'published_at', 'id',
+                 postgresql_where=db.text("status = 'approved'")),
+        db.Index('ix_content_approved_category_published', 'category_id', 'published_at', 'id',
+                 postgresql_where=db.text("status = 'approved'")),
+        db.Index('ix_content_approved_type_published', 'content_type', 'published_at', 'id',
+                 postgresql_where=db.text("status = 'approved'")),
+        db.Index('ix_content_approved_views', 'views_count',
+                 postgresql_where=db.text("status = 'approved'")),
+        db.Index('ix_content_pending_created', 'created_at', 'id',
+                 postgresql_where=db.text("status = 'pending'")),
+        db.Index('ix_content_approved_hot', 'hot_score', 'id',
+                 postgresql_where=db.text("status = 'approved'")),
+        db.Index('ix_content_approved_week', 'week_score', 'id',
+                 postgresql_where=db.text("status = 'approved' AND week_score IS NOT NULL")),
+        # Watermarks for the listing validators (max(updated_at) per filter)
+        db.Index('ix_content_updated', 'updated_at'),
+        db.Index('ix_content_category_updated', 'category_id', 'updated_at'),
+    )
 
     # ✅ Updated constructor (Option 2)
     def __init__(self, title, content_type, author_id, category_id, description=None, 
@@ -83,7 +203,7 @@ class Content(db.Model):
             'views_count': self.views_count,
             'likes_count': self.likes_count,
             'dislikes_count': self.dislikes_count,
-            'comments_count': self.comments.count(),
+            'comments_count': self.comments_count,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'published_at': self.published_at.isoformat() if self.published_at else None,
@@ -95,10 +215,300 @@ class Content(db.Model):
         
         return data
     
-    def increment_views(self):
-        """Increment view count"""
-        self.views_count += 1
+    def to_sparse_dict(self, fields):
+        """Serialize only the requested fields (see SPARSE_FIELDS); id is always included"""
+        data = {'id': self.id}
+        
+        for name in fields:
+            if name == 'author':
+                data['author'] = {'id': self.author.id, 'username': self.author.username}
+            elif name == 'category':
+                data['category'] = {
+                    'id': self.category.id,
+                    'name': self.category.name,
+                    'slug': self.category.slug
+                }
+            else:
+                value = getattr(self, name)
+                data[name] = value.isoformat() if isinstance(value, datetime) else value
+        
+        return data
+    
+    @staticmethod
+    def listing_options(fields=None, via=None):
+        """
+        Loader options for content listings
+        
+        Lists never show the body, so it is not loaded. With a sparse fieldset
+        only the columns backing the requested fields are selected, and
+        author/category are joined only when asked for.
+        
+        Args:
+            fields: Field names from SPARSE_FIELDS, or None for everything
+            via: Loader option for a relationship to Content (e.g.
+                db.joinedload(Wishlist.content)) when content is not the
+                primary entity of the query
+        """
+        from app.models.user import User
+        from app.models.category import Category
+        
+        # Options chain off the relationship loader, or start at Content
+        load = via if via is not None else db
+        
+        if fields is None:
+            return (load.joinedload(Content.author), load.joinedload(Content.category),
+                    load.defer(Content.body))
+        
+        # Sort keys are always loaded so cursors can be built from the items
+        columns = {'id', 'published_at', 'created_at', 'hot_score', 'week_score'}
+        columns.update(SPARSE_FIELDS[name] for name in fields)
+        options = [load.load_only(*(getattr(Content, name) for name in sorted(columns)))]
+        
+        if 'author' in fields:
+            options.append(load.joinedload(Content.author).load_only(User.id, User.username))
+        if 'category' in fields:
+            options.append(load.joinedload(Content.category).load_only(Category.id, Category.name, Category.slug))
+        
+        return tuple(options)
+    
+    @staticmethod
+    def to_dict_list(contents, include_body=False, fields=None):
+        """Serialize a list of content without per-item queries"""
+        if fields is not None:
+            return [content.to_sparse_dict(fields) for content in contents]
+        return [content.to_dict(include_body=include_body) for content in contents]
+    
+    @staticmethod
+    def validators(content_id):
+        """
+        Conditional GET validators for a published content item
+        
+        Returns:
+            tuple: (etag, last_modified), or None if the item is not public
+        """
+        from app.models.category import Category
+        from app.models.user import User
+        from app.utils.conditional import make_etag, latest
+        
+        row = db.session.query(
+            Content.status, Content.updated_at, Category.updated_at, User.updated_at
+        ).join(Category, Content.category_id == Category.id)\
+            .join(User, Content.author_id == User.id)\
+            .filter(Content.id == content_id).first()
+        if row is None or row[0] != 'approved':
+            return None
+        
+        _, content_updated, category_updated, author_updated = row
+        etag = make_etag('content', content_id, content_updated, category_updated, author_updated)
+        return etag, latest(content_updated, category_updated, author_updated)
+    
+    @staticmethod
+    def listing_validators(category_id=None, content_type=None, sort=None):
+        """
+        Conditional GET validators for the published content listing
+        
+        The ETag hashes watermarks that are each one index lookup:
+        
+        - max(updated_at) over the filtered rows of any status. Approvals,
+          edits, counter updates and removals (a status change) move it, and
+          so does a username change, which touches that author's content.
+        - count and max(updated_at) of the small categories table. Category
+          edits move it, and so do hard deletes of content, since
+          content_category_touch_trigger touches the item's category.
+        - For score sorted feeds, max(scored_at), which moves when
+          refresh_scores re-ranks them.
+        
+        There is no Last-Modified: the watermarks come from both application
+        and database clocks, so only the ETag is a reliable validator.
+        
+        Returns:
+            tuple: (etag, None)
+        """
+        from app.models.category import Category
+        from app.utils.conditional import make_etag
+        
+        content_updated = db.select(db.func.max(Content.updated_at))
+        if category_id:
+            content_updated = content_updated.where(Content.category_id == category_id)
+        if content_type:
+            content_updated = content_updated.where(Content.content_type == content_type)
+        
+        watermarks = [
+            content_updated.scalar_subquery(),
+            db.select(db.func.count(Category.id)).scalar_subquery(),
+            db.select(db.func.max(Category.updated_at)).scalar_subquery()
+        ]
+        if sort in ('hot', 'top_week'):
+            watermarks.append(db.select(db.func.max(Content.scored_at)).scalar_subquery())
+        
+        etag = make_etag('content-list', *db.session.query(*watermarks).one())
+        return etag, None
+    
+    @staticmethod
+    def filter_by_tags(query, tags, match='any'):
+        """
+        Restrict a content query to items carrying the given tags
+        
+        Uses the array overlap (&&) or containment (@>) operator, both of
+        which the GIN index on tags can answer.
+        
+        Args:
+            query: Content query to filter
+            tags: List of tag names
+            match: 'any' for at least one of the tags, 'all' for every tag
+        """
+        if match == 'all':
+            return query.filter(Content.tags.contains(tags))
+        return query.filter(Content.tags.overlap(tags))
+    
+    @staticmethod
+    def tag_counts(limit=None):
+        """
+        Tag frequencies over approved content, most used first
+        
+        The unnest/GROUP BY aggregate is kept in the aggregate cache per limit
+        and dropped together with the public content listings whenever
+        published content changes.
+        
+        Args:
+            limit: Most used tags to return, or None for all of them
+        
+        Returns:
+            list: [{'tag': str, 'count': int}, ...]
+        """
+        from app.utils.cache import cache
+        
+        key = f'{TAG_COUNTS_CACHE_KEY}:{limit or "all"}'
+        cached = cache.get(key, aggregate=True)
+        if cached is not None:
+            return json.loads(cached)
+        
+        tag = db.func.unnest(Content.tags).label('tag')
+        tagged = db.session.query(tag).filter(Content.status == 'approved').subquery()
+        total = db.func.count().label('count')
+        rows = db.session.query(tagged.c.tag, total)\
+            .group_by(tagged.c.tag)\
+            .order_by(total.desc(), tagged.c.tag)\
+            .limit(limit)\
+            .all()
+        
+        counts = [{'tag': row.tag, 'count': row.count} for row in rows]
+        cache.set(key, json.dumps(counts).encode('utf-8'), tags=['content-list'], aggregate=True)
+        return counts
+    
+    @staticmethod
+    def apply_sort(query, sort):
+        """
+        Order a published content query by a feed sort
+        
+        Args:
+            query: Content query to order
+            sort: 'new', 'hot' or 'top_week'
+        
+        Returns:
+            tuple: (query, sort column) - the query is filtered but not yet
+            ordered, so it can be paged by (sort column, id) or with offsets
+        """
+        if sort == 'hot':
+            return query, Content.hot_score
+        if sort == 'top_week':
+            return query.filter(Content.week_score.isnot(None)), Content.week_score
+        return query, Content.published_at
+    
+    @staticmethod
+    def refresh_scores(now=None, content_ids=None):
+        """
+        Recompute hot and top-of-the-week scores
+        
+        Scores are computed in SQL and only rows whose score changed are
+        written, so a run after a quiet period touches few rows. Content that
+        left the week window or was unpublished loses its week_score.
+        updated_at is left alone (re-ranking is not an edit); rewritten rows
+        get a new scored_at instead, which the feed validators watch. Commits, along
+        with anything already pending in the session.
+        
+        Args:
+            now: Time to score against (defaults to now)
+            content_ids: Only rescore these items, e.g. one just approved
+        
+        Returns:
+            int: Number of content rows updated
+        """
+        now = now or datetime.utcnow()
+        func = db.func
+        
+        published = func.coalesce(Content.published_at, Content.created_at)
+        popularity = func.coalesce(Content.likes_count, 0) - func.coalesce(Content.dislikes_count, 0)\
+            + func.coalesce(Content.views_count, 0) / float(VIEWS_PER_VOTE)
+        hot = func.sign(popularity) * func.log(func.greatest(func.abs(popularity), 1))\
+            + (func.extract('epoch', published) - HOT_EPOCH) / HOT_DECAY_SECONDS
+        week = db.case(
+            (published >= now - timedelta(days=TOP_WEEK_DAYS), popularity),
+            else_=None
+        )
+        
+        rows = Content.query
+        if content_ids is not None:
+            rows = rows.filter(Content.id.in_(content_ids))
+        
+        scored = rows.filter(
+            Content.status == 'approved',
+            db.or_(Content.hot_score.is_distinct_from(hot), Content.week_score.is_distinct_from(week))
+        ).update({
+            Content.hot_score: hot,
+            Content.week_score: week,
+            Content.scored_at: now,
+            Content.updated_at: Content.updated_at
+        }, synchronize_session=False)
+        
+        cleared = rows.filter(Content.status != 'approved', Content.week_score.isnot(None))\
+            .update({Content.week_score: None, Content.scored_at: now, Content.updated_at: Content.updated_at},
+                    synchronize_session=False)
+        
+        db.session.commit()
+        return scored + cleared
+    
+    @staticmethod
+    def recount_comments():
+        """Recompute comments_count for all content in one statement"""
+        from app.models.comment import Comment
+        
+        actual = db.select(db.func.count(Comment.id))\
+            .where(Comment.content_id == Content.id)\
+            .scalar_subquery()
+        
+        fixed = Content.query.filter(Content.comments_count != actual)\
+            .update({Content.comments_count: actual}, synchronize_session=False)
         db.session.commit()
+        return fixed
+    
+    def increment_views(self):
+        """Count a view; persisted in batches by the view counter"""
+        from app.utils.view_counter import view_counter
+        
+        view_counter.record(self.id)
     
     def __repr__(self):
         return f'<Content {self.title} ({self.status})>'
+
+
+db.event.listen(
+    Content.__table__,
+    'after_create',
+    db.DDL(SEARCH_VECTOR_FUNCTION_DDL).execute_if(dialect='postgresql')
+)
+db.event.listen(
+    Content.__table__,
+    'after_create',
+    db.DDL(SEARCH_VECTOR_TRIGGER_DDL).execute_if(dialect='postgresql')
+)
+db.event.listen(
+    Content.__table__,
+    'after_create',
+    db.DDL(CATEGORY_TOUCH_FUNCTION_DDL).execute_if(dialect='postgresql')
+)
+db.event.listen(
+    Content.__table__,
+    'after_create',
+    db.DDL(CATEGORY_TOUCH_TRIGGER_DDL).execute_if(dialect='postgresql')
+)
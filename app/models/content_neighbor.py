@@ -0,0 +1,137 @@
+from app import db
+
+# Item-to-item neighbors built offline by `flask build-recommendations`
+NEIGHBORS_PER_ITEM = 20
+MIN_CO_USERS = 2  # users two items must share to count as neighbors
+MAX_ITEMS_PER_USER = 200  # most recent interactions of a user that are used
+
+
+class ContentNeighbor(db.Model):
+    __tablename__ = 'content_neighbors'
+    
+    # The primary key leads with content_id, so a user's seed items look up
+    # their neighbors in one index scan
+    content_id = db.Column(db.Integer, db.ForeignKey('content.id', ondelete='CASCADE'), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey('content.id', ondelete='CASCADE'), primary_key=True,
+                            index=True)
+    score = db.Column(db.Float, nullable=False)  # cosine similarity in [0, 1]
+    
+    def __repr__(self):
+        return f'<ContentNeighbor {self.content_id} -> {self.neighbor_id} ({self.score:.3f})>'
+    
+    @staticmethod
+    def interactions():
+        """Positive (user_id, content_id) signals: likes and wishlist entries"""
+        from app.models.content_review import ContentReview
+        from app.models.wishlist import Wishlist
+        
+        return db.union(
+            db.select(ContentReview.user_id, ContentReview.content_id, ContentReview.created_at)
+            .where(ContentReview.review_type == 'like'),
+            db.select(Wishlist.user_id, Wishlist.content_id, Wishlist.created_at)
+        ).subquery('interactions')
+    
+    @staticmethod
+    def rebuild(neighbors_per_item=NEIGHBORS_PER_ITEM, min_co_users=MIN_CO_USERS,
+                max_items_per_user=MAX_ITEMS_PER_USER):
+        """
+        Recompute the neighbor table from likes and wishlists in one statement
+        
+        Cosine similarity over the binary user x item matrix A: the pair
+        counts of A^T A come from a self-join of the interactions on user_id,
+        divided by the square roots of both items' user counts. Only the top
+        neighbors_per_item neighbors of each approved item are kept. Each
+        user's most recent max_items_per_user interactions bound the
+        per-user pair fan-out.
+        
+        Returns:
+            int: Number of neighbor rows written
+        """
+        from app.models.content import Content
+        
+        interactions = ContentNeighbor.interactions()
+        recency = db.func.row_number().over(
+            partition_by=interactions.c.user_id,
+            order_by=(interactions.c.created_at.desc(), interactions.c.content_id.desc())
+        ).label('recency')
+        ranked = db.select(interactions.c.user_id, interactions.c.content_id, recency)\
+            .join(Content, Content.id == interactions.c.content_id)\
+            .where(Content.status == 'approved')\
+            .subquery('ranked')
+        # A user both liking and wishlisting an item counts once
+        signals = db.select(ranked.c.user_id, ranked.c.content_id)\
+            .where(ranked.c.recency <= max_items_per_user)\
+            .distinct()\
+            .cte('signals')
+        
+        item_users = db.select(signals.c.content_id, db.func.count().label('users'))\
+            .group_by(signals.c.content_id)\
+            .cte('item_users')
+        
+        a, b = signals.alias('a'), signals.alias('b')
+        pairs = db.select(a.c.content_id, b.c.content_id.label('neighbor_id'), db.func.count().label('together'))\
+            .join(b, db.and_(a.c.user_id == b.c.user_id, a.c.content_id != b.c.content_id))\
+            .group_by(a.c.content_id, b.c.content_id)\
+            .having(db.func.count() >= min_co_users)\
+            .cte('pairs')
+        
+        users_a, users_b = item_users.alias('users_a'), item_users.alias('users_b')
+        similarity = pairs.c.together / db.func.sqrt(db.cast(users_a.c.users * users_b.c.users, db.Float))
+        closeness = db.func.row_number().over(
+            partition_by=pairs.c.content_id,
+            order_by=(similarity.desc(), pairs.c.neighbor_id)
+        )
+        scored = db.select(pairs.c.content_id, pairs.c.neighbor_id,
+                           similarity.label('score'), closeness.label('closeness'))\
+            .join(users_a, users_a.c.content_id == pairs.c.content_id)\
+            .join(users_b, users_b.c.content_id == pairs.c.neighbor_id)\
+            .subquery('scored')
+        
+        table = ContentNeighbor.__table__
+        db.session.execute(table.delete())
+        result = db.session.execute(
+            table.insert().from_select(
+                ['content_id', 'neighbor_id', 'score'],
+                db.select(scored.c.content_id, scored.c.neighbor_id, scored.c.score)
+                .where(scored.c.closeness <= neighbors_per_item)
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+    
+    @staticmethod
+    def recommended_query(user_id):
+        """
+        Approved content similar to what a user liked or wishlisted, best first
+        
+        One statement: the user's seed items (via the (user_id, content_id)
+        unique indexes) pick their neighbor rows by primary key, scores are
+        summed per neighbor, and items the user already reviewed or
+        wishlisted are left out.
+        
+        Returns:
+            Query: Content ordered by summed similarity, without a limit
+        """
+        from app.models.content import Content
+        from app.models.content_review import ContentReview
+        from app.models.wishlist import Wishlist
+        
+        seeds = db.union(
+            db.select(ContentReview.content_id)
+            .where(ContentReview.user_id == user_id, ContentReview.review_type == 'like'),
+            db.select(Wishlist.content_id).where(Wishlist.user_id == user_id)
+        )
+        seen = db.union(
+            db.select(ContentReview.content_id).where(ContentReview.user_id == user_id),
+            db.select(Wishlist.content_id).where(Wishlist.user_id == user_id)
+        )
+        
+        scores = db.select(ContentNeighbor.neighbor_id, db.func.sum(ContentNeighbor.score).label('score'))\
+            .where(ContentNeighbor.content_id.in_(seeds))\
+            .where(ContentNeighbor.neighbor_id.not_in(seen))\
+            .group_by(ContentNeighbor.neighbor_id)\
+            .subquery('scores')
+        
+        return Content.query.join(scores, Content.id == scores.c.neighbor_id)\
+            .filter(Content.status == 'approved')\
+            .order_by(scores.c.score.desc(), Content.id.desc())
@@ -1,11 +1,12 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
 
 class ContentReview(db.Model):
     __tablename__ = 'content_reviews'
     
     id = db.Column(db.Integer, primary_key=True)
-    content_id = db.Column(db.Integer, db.ForeignKey('content.id'), nullable=False)
+    content_id = db.Column(db.Integer, db.ForeignKey('content.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     review_type = db.Column(db.String(10), nullable=False)  # 'like' or 'dislike'
     
@@ -39,19 +40,109 @@ class ContentReview(db.Model):
         }
     
     @staticmethod
-    def update_content_counts(content_id):
-        """Update like and dislike counts for content"""
+    def upsert(content_id, user_id, review_type):
+        """
+        Create or change a user's review in one INSERT ... ON CONFLICT statement
+        
+        The conflict update only fires when the type actually changes, and
+        PostgreSQL's xmax tells inserted rows from updated ones. With two review
+        types that is enough to recover the previous type without a SELECT, and
+        it stays correct when concurrent requests race on the unique constraint.
+        
+        Args:
+            content_id: ID of the reviewed content
+            user_id: ID of the reviewing user
+            review_type: 'like' or 'dislike'
+        
+        Returns:
+            tuple: (previous_type or None, new_type)
+        """
+        table = ContentReview.__table__
+        now = datetime.utcnow()
+        
+        stmt = insert(table).values(
+            content_id=content_id,
+            user_id=user_id,
+            review_type=review_type,
+            created_at=now,
+            updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='unique_user_content_review',
+            set_={'review_type': stmt.excluded.review_type, 'updated_at': stmt.excluded.updated_at},
+            where=table.c.review_type != stmt.excluded.review_type
+        ).returning(db.literal_column('xmax = 0').label('inserted'))
+        
+        row = db.session.execute(stmt).first()
+        
+        if row is None:
+            # Same review as before; nothing changed
+            return review_type, review_type
+        if row.inserted:
+            return None, review_type
+        return ('dislike' if review_type == 'like' else 'like'), review_type
+    
+    @staticmethod
+    def remove(content_id, user_id):
+        """
+        Delete a user's review in one statement
+        
+        Returns:
+            str: The removed review type, or None if there was no review
+        """
+        table = ContentReview.__table__
+        stmt = table.delete()\
+            .where(table.c.content_id == content_id)\
+            .where(table.c.user_id == user_id)\
+            .returning(table.c.review_type)
+        return db.session.execute(stmt).scalar()
+    
+    @staticmethod
+    def apply_count_change(content_id, previous_type, new_type):
+        """
+        Adjust like/dislike counters for a review change with in-SQL deltas
+        
+        Runs in the caller's transaction, so counters commit together with
+        the review itself.
+        
+        Args:
+            content_id: ID of the reviewed content
+            previous_type: Review type before the change, or None if there was none
+            new_type: Review type after the change, or None if it was removed
+        """
+        from app.models.content import Content
+        
+        changes = {}
+        for review_type, column in (('like', Content.likes_count), ('dislike', Content.dislikes_count)):
+            delta = (new_type == review_type) - (previous_type == review_type)
+            if delta:
+                changes[column] = db.func.coalesce(column, 0) + delta
+        
+        if changes:
+            Content.query.filter_by(id=content_id).update(changes, synchronize_session=False)
+    
+    @staticmethod
+    def recount_all_content_counts():
+        """Recompute like and dislike counts for all content in one statement"""
         from app.models.content import Content
         
-        content = Content.query.get(content_id)
-        if content:
-            content.likes_count = ContentReview.query.filter_by(
-                content_id=content_id, review_type='like'
-            ).count()
-            content.dislikes_count = ContentReview.query.filter_by(
-                content_id=content_id, review_type='dislike'
-            ).count()
-            db.session.commit()
+        def count_of(review_type):
+            return db.select(db.func.count(ContentReview.id))\
+                .where(ContentReview.content_id == Content.id)\
+                .where(ContentReview.review_type == review_type)\
+                .scalar_subquery()
+        
+        likes, dislikes = count_of('like'), count_of('dislike')
+        
+        fixed = Content.query.filter(db.or_(
+            db.func.coalesce(Content.likes_count, 0) != likes,
+            db.func.coalesce(Content.dislikes_count, 0) != dislikes
+        )).update({
+            Content.likes_count: likes,
+            Content.dislikes_count: dislikes
+        }, synchronize_session=False)
+        db.session.commit()
+        return fixed
     
     def __repr__(self):
         return f'<ContentReview {self.review_type} by User:{self.user_id} on Content:{self.content_id}>'
\ No newline at end of file
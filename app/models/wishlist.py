@@ -6,7 +6,7 @@ class Wishlist(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    content_id = db.Column(db.Integer, db.ForeignKey('content.id'), nullable=False)
+    content_id = db.Column(db.Integer, db.ForeignKey('content.id', ondelete='CASCADE'), nullable=False, index=True)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -24,7 +24,7 @@ class Wishlist(db.Model):
         self.user_id = user_id
         self.content_id = content_id
     
-    def to_dict(self, include_content=True):
+    def to_dict(self, include_content=True, fields=None):
         """Convert wishlist object to dictionary"""
         data = {
             'id': self.id,
@@ -34,9 +34,24 @@ class Wishlist(db.Model):
         }
         
         if include_content:
-            data['content'] = self.content.to_dict()
+            if fields is not None:
+                data['content'] = self.content.to_sparse_dict(fields)
+            else:
+                data['content'] = self.content.to_dict()
         
         return data
     
+    @staticmethod
+    def listing_options(fields=None):
+        """Loader options that fetch content, author and category with the listing query"""
+        from app.models.content import Content
+        
+        return Content.listing_options(fields, via=db.joinedload(Wishlist.content))
+    
+    @staticmethod
+    def to_dict_list(items, fields=None):
+        """Serialize wishlist items and their content without per-item queries"""
+        return [item.to_dict(include_content=True, fields=fields) for item in items]
+    
     def __repr__(self):
         return f'<Wishlist User:{self.user_id} Content:{self.content_id}>'
\ No newline at end of file
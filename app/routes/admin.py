@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app import db
@@ -6,6 +6,8 @@ from app.models.user import User
 from app.models.content import Content
 from app.models.category import Category
 from app.utils.decorators import admin_required
+from app.utils.pagination import keyset_paginate, offset_paginate, COUNT_MODES
+from app.utils.cache import cache, invalidate_content, invalidate_categories
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -62,6 +64,7 @@ def get_users():
     """Admin: Get all users with filtering"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count = request.args.get('count', 'exact')
     role = request.args.get('role')
     is_active = request.args.get('is_active')
     
@@ -73,14 +76,19 @@ def get_users():
     if is_active is not None:
         query = query.filter_by(is_active=is_active.lower() == 'true')
     
+    if count not in COUNT_MODES:
+        return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
+    
     # Paginate
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    page_data = offset_paginate(query, page=page, per_page=per_page, count=count)
     
     return jsonify({
-        'users': [user.to_dict(include_email=True) for user in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        'users': [user.to_dict(include_email=True) for user in page_data['items']],
+        'total': page_data['total'],
+        'total_exact': page_data['total_exact'],
+        'pages': page_data['pages'],
+        'current_page': page,
+        'has_next': page_data['has_next']
     }), 200
 
 @admin_bp.route('/users/<int:user_id>/deactivate', methods=['PUT'])
@@ -141,16 +149,37 @@ def get_pending_content():
     """Admin: Get all pending content"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count = request.args.get('count', 'exact')
+    cursor = request.args.get('cursor')
+    
+    query = Content.query.options(*Content.listing_options()).filter_by(status='pending')
+    
+    if cursor is not None:
+        try:
+            page_data = keyset_paginate(query, Content.created_at, Content.id,
+                                        cursor=cursor, per_page=per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return jsonify({
+            'content': Content.to_dict_list(page_data['items']),
+            'next_cursor': page_data['next_cursor'],
+            'prev_cursor': page_data['prev_cursor']
+        }), 200
+    
+    if count not in COUNT_MODES:
+        return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
     
-    pagination = Content.query.filter_by(status='pending')\
-        .order_by(Content.created_at.desc())\
-        .paginate(page=page, per_page=per_page, error_out=False)
+    page_data = offset_paginate(query.order_by(Content.created_at.desc()),
+                                page=page, per_page=per_page, count=count)
     
     return jsonify({
-        'content': [content.to_dict() for content in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        'content': Content.to_dict_list(page_data['items']),
+        'total': page_data['total'],
+        'total_exact': page_data['total_exact'],
+        'pages': page_data['pages'],
+        'current_page': page,
+        'has_next': page_data['has_next']
     }), 200
 
 @admin_bp.route('/content/<int:content_id>/approve', methods=['PUT'])
@@ -169,7 +198,10 @@ def approve_content(content_id):
     content.published_at = datetime.utcnow()
     
     try:
-        db.session.commit()
+        db.session.flush()
+        # Rank it in the hot and top_week feeds now, not at the next refresh-scores run
+        Content.refresh_scores(content_ids=[content_id])
+        invalidate_content(content_id)
         
         # TODO: Send notification to subscribers
         
@@ -200,6 +232,7 @@ def flag_content(content_id):
     
     try:
         db.session.commit()
+        invalidate_content(content_id)
         
         # TODO: Send notification to content author
         
@@ -224,6 +257,7 @@ def remove_content(content_id):
     try:
         db.session.delete(content)
         db.session.commit()
+        invalidate_content(content_id)
         
         return jsonify({
             'message': 'Content removed successfully'
@@ -260,6 +294,7 @@ def create_category():
     try:
         db.session.add(category)
         db.session.commit()
+        cache.invalidate('categories')
         
         return jsonify({
             'message': 'Category created successfully',
@@ -304,6 +339,7 @@ def update_category(category_id):
     
     try:
         db.session.commit()
+        invalidate_categories()
         return jsonify({
             'message': 'Category updated successfully',
             'category': category.to_dict()
@@ -329,10 +365,24 @@ def delete_category(category_id):
     try:
         db.session.delete(category)
         db.session.commit()
+        invalidate_categories()
         
         return jsonify({
             'message': 'Category deleted successfully'
         }), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': f'Failed to delete category: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Failed to delete category: {str(e)}'}), 500
+
+# ==================== CACHE ====================
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    """Admin: Cache hit rates of this worker process, by key namespace"""
+    return jsonify({
+        'backend': current_app.config.get('CACHE_BACKEND', 'memory'),
+        'max_entries': current_app.config.get('CACHE_MAX_ENTRIES'),
+        'stats': cache.stats.snapshot()
+    }), 200
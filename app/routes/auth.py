@@ -1,7 +1,9 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.models.content import Content
 from app.utils.decorators import active_user_required
 
 auth_bp = Blueprint('auth', __name__)
@@ -115,6 +117,10 @@ def update_profile():
         existing_user = User.query.filter_by(username=data['username']).first()
         if existing_user and existing_user.id != user.id:
             return jsonify({'error': 'Username already exists'}), 409
+        if data['username'] != user.username:
+            # Content embeds its author's username; touch it so listing ETags move
+            Content.query.filter_by(author_id=user.id)\
+                .update({Content.updated_at: datetime.utcnow()}, synchronize_session=False)
         user.username = data['username']
     
     if 'email' in data:
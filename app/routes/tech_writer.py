@@ -6,6 +6,9 @@ from app.models.content import Content
 from app.models.category import Category
 from app.models.content_review import ContentReview
 from app.utils.decorators import tech_writer_or_admin_required
+from app.utils.pagination import keyset_paginate, offset_paginate, COUNT_MODES
+from app.utils.cache import cache, invalidate_content
+from app.utils.viewer_state import invalidate_viewer_state
 
 writer_bp = Blueprint('tech_writer', __name__)
 
@@ -54,6 +57,7 @@ def create_content():
     try:
         db.session.add(content)
         db.session.commit()
+        invalidate_content(content.id)
         
         return jsonify({
             'message': 'Content created successfully',
@@ -104,6 +108,7 @@ def update_content(content_id):
     
     try:
         db.session.commit()
+        invalidate_content(content_id)
         return jsonify({
             'message': 'Content updated successfully',
             'content': content.to_dict(include_body=True)
@@ -133,6 +138,7 @@ def delete_content(content_id):
     try:
         db.session.delete(content)
         db.session.commit()
+        invalidate_content(content_id)
         
         return jsonify({
             'message': 'Content deleted successfully'
@@ -149,21 +155,41 @@ def get_my_content():
     current_user_id = get_jwt_identity()
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count = request.args.get('count', 'exact')
     status = request.args.get('status')
+    cursor = request.args.get('cursor')
     
-    query = Content.query.filter_by(author_id=current_user_id)
+    query = Content.query.options(*Content.listing_options()).filter_by(author_id=current_user_id)
     
     if status:
         query = query.filter_by(status=status)
     
-    pagination = query.order_by(Content.created_at.desc())\
-        .paginate(page=page, per_page=per_page, error_out=False)
+    if cursor is not None:
+        try:
+            page_data = keyset_paginate(query, Content.created_at, Content.id,
+                                        cursor=cursor, per_page=per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return jsonify({
+            'content': Content.to_dict_list(page_data['items']),
+            'next_cursor': page_data['next_cursor'],
+            'prev_cursor': page_data['prev_cursor']
+        }), 200
+    
+    if count not in COUNT_MODES:
+        return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
+    
+    page_data = offset_paginate(query.order_by(Content.created_at.desc()),
+                                page=page, per_page=per_page, count=count)
     
     return jsonify({
-        'content': [content.to_dict() for content in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        'content': Content.to_dict_list(page_data['items']),
+        'total': page_data['total'],
+        'total_exact': page_data['total_exact'],
+        'pages': page_data['pages'],
+        'current_page': page,
+        'has_next': page_data['has_next']
     }), 200
 
 # ==================== CONTENT APPROVAL (Tech Writer can approve) ====================
@@ -187,7 +213,10 @@ def approve_content(content_id):
     content.published_at = datetime.utcnow()
     
     try:
-        db.session.commit()
+        db.session.flush()
+        # Rank it in the hot and top_week feeds now, not at the next refresh-scores run
+        Content.refresh_scores(content_ids=[content_id])
+        invalidate_content(content_id)
         
         # TODO: Send notification to subscribers
         
@@ -218,6 +247,7 @@ def flag_content(content_id):
     
     try:
         db.session.commit()
+        invalidate_content(content_id)
         
         # TODO: Send notification to content author and admin
         
@@ -246,29 +276,17 @@ def review_content(content_id):
     if not data.get('review_type') or data['review_type'] not in ['like', 'dislike']:
         return jsonify({'error': 'Invalid review type'}), 400
     
-    # Check if user already reviewed
-    existing_review = ContentReview.query.filter_by(
-        content_id=content_id,
-        user_id=current_user_id
-    ).first()
-    
     try:
-        if existing_review:
-            # Update existing review
-            existing_review.review_type = data['review_type']
-        else:
-            # Create new review
-            review = ContentReview(
-                content_id=content_id,
-                user_id=current_user_id,
-                review_type=data['review_type']
-            )
-            db.session.add(review)
+        # Insert or change the review in one statement
+        previous_type, new_type = ContentReview.upsert(
+            content_id, current_user_id, data['review_type']
+        )
         
+        # Update content counts in the same transaction
+        ContentReview.apply_count_change(content_id, previous_type, new_type)
         db.session.commit()
-        
-        # Update content counts
-        ContentReview.update_content_counts(content_id)
+        cache.invalidate(f'content:{content_id}')
+        invalidate_viewer_state(current_user_id)
         
         return jsonify({
             'message': 'Review submitted successfully',
@@ -285,20 +303,17 @@ def remove_review(content_id):
     """Tech Writer: Remove own review"""
     current_user_id = get_jwt_identity()
     
-    review = ContentReview.query.filter_by(
-        content_id=content_id,
-        user_id=current_user_id
-    ).first()
-    
-    if not review:
-        return jsonify({'error': 'Review not found'}), 404
-    
     try:
-        db.session.delete(review)
-        db.session.commit()
+        removed_type = ContentReview.remove(content_id, current_user_id)
+        
+        if not removed_type:
+            db.session.rollback()
+            return jsonify({'error': 'Review not found'}), 404
         
-        # Update content counts
-        ContentReview.update_content_counts(content_id)
+        ContentReview.apply_count_change(content_id, removed_type, None)
+        db.session.commit()
+        cache.invalidate(f'content:{content_id}')
+        invalidate_viewer_state(current_user_id)
         
         return jsonify({
             'message': 'Review removed successfully'
@@ -335,6 +350,7 @@ def create_category():
     try:
         db.session.add(category)
         db.session.commit()
+        cache.invalidate('categories')
         
         return jsonify({
             'message': 'Category created successfully',
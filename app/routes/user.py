@@ -1,30 +1,61 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func, desc
 from app import db
-from app.models.content import Content
+from app.models.content import Content, SPARSE_FIELDS
 from app.models.category import Category
 from app.models.comment import Comment
 from app.models.subscription import Subscription
 from app.models.wishlist import Wishlist
 from app.models.content_review import ContentReview
+from app.models.content_neighbor import ContentNeighbor
 from app.utils.decorators import active_user_required
+from app.utils.validators import validate_fields, validate_id_list
+from app.utils.pagination import keyset_paginate, offset_paginate, COUNT_MODES
+from app.utils.search import apply_search
+from app.utils.view_counter import view_counter
+from app.utils.cache import cache
+from app.utils.conditional import conditional_response
+from app.utils.facets import normalize_filters, get_facets
+from app.utils.comment_cache import get_thread_page, invalidate_thread
+from app.utils.viewer_state import get_viewer_state, get_viewer_states, invalidate_viewer_state
 
 user_bp = Blueprint('user', __name__)
 
 # ==================== CONTENT BROWSING ====================
 
 @user_bp.route('/content', methods=['GET'])
+@conditional_response(lambda: Content.listing_validators(
+    category_id=request.args.get('category_id', type=int),
+    content_type=request.args.get('content_type'),
+    sort=request.args.get('sort')
+))
+@cache.cached_response(tags=['content', 'content-list'])
 def get_content():
     """Get all published content with filtering"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count = request.args.get('count', 'exact')
     category_id = request.args.get('category_id', type=int)
     content_type = request.args.get('content_type')
     search = request.args.get('search')
+    tags = [tag.strip() for tag in request.args.get('tags', '').split(',') if tag.strip()]
+    tag_match = request.args.get('tag_match', 'any')
+    sort = request.args.get('sort')
+    cursor = request.args.get('cursor')
+    
+    if tag_match not in ('any', 'all'):
+        return jsonify({'error': "tag_match must be 'any' or 'all'"}), 400
+    
+    if sort is not None and sort not in ('new', 'hot', 'top_week'):
+        return jsonify({'error': "sort must be 'new', 'hot' or 'top_week'"}), 400
+    
+    fields, error = validate_fields(request.args.get('fields'), SPARSE_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
     
     # Base query - only approved content
-    query = Content.query.filter_by(status='approved')
+    query = Content.query.options(*Content.listing_options(fields)).filter_by(status='approved')
     
     # Apply filters
     if category_id:
@@ -33,27 +64,116 @@ def get_content():
     if content_type:
         query = query.filter_by(content_type=content_type)
     
+    if tags:
+        query = Content.filter_by_tags(query, tags, match=tag_match)
+    
+    rank = None
     if search:
-        search_term = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                Content.title.ilike(search_term),
-                Content.description.ilike(search_term)
-            )
-        )
+        query, rank = apply_search(query, search)
+    
+    query, sort_column = Content.apply_sort(query, sort)
+    
+    # Cursor mode: keyset pagination on (sort column, id), no total count
+    if cursor is not None:
+        try:
+            page_data = keyset_paginate(query, sort_column, Content.id,
+                                        cursor=cursor, per_page=per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return jsonify({
+            'content': Content.to_dict_list(page_data['items'], fields=fields),
+            'next_cursor': page_data['next_cursor'],
+            'prev_cursor': page_data['prev_cursor']
+        }), 200
+    
+    # Best matches first when searching without an explicit sort
+    if rank is not None and sort is None:
+        query = query.order_by(rank.desc(), Content.published_at.desc(), Content.id.desc())
+    else:
+        query = query.order_by(sort_column.desc(), Content.id.desc())
+    
+    if count not in COUNT_MODES:
+        return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
+    
+    page_data = offset_paginate(query, page=page, per_page=per_page, count=count)
+    
+    return jsonify({
+        'content': Content.to_dict_list(page_data['items'], fields=fields),
+        'total': page_data['total'],
+        'total_exact': page_data['total_exact'],
+        'pages': page_data['pages'],
+        'current_page': page,
+        'has_next': page_data['has_next']
+    }), 200
+
+@user_bp.route('/content/facets', methods=['GET'])
+def get_content_facets():
+    """Get per-category, content type and tag counts for the current filters"""
+    tag_match = request.args.get('tag_match', 'any')
+    
+    if tag_match not in ('any', 'all'):
+        return jsonify({'error': "tag_match must be 'any' or 'all'"}), 400
+    
+    filters = normalize_filters(
+        category_id=request.args.get('category_id', type=int),
+        content_type=request.args.get('content_type'),
+        search=request.args.get('search'),
+        tags=[tag.strip() for tag in request.args.get('tags', '').split(',') if tag.strip()],
+        tag_match=tag_match
+    )
+    
+    return jsonify({
+        'filters': filters,
+        'facets': get_facets(filters)
+    }), 200
+
+@user_bp.route('/content/batch', methods=['GET'])
+def get_content_batch():
+    """Get several published content items by id in one request (views are not counted)"""
+    ids, error = validate_id_list(request.args.get('ids'), current_app.config['CONTENT_BATCH_MAX_IDS'])
+    if error:
+        return jsonify({'error': error}), 400
+    
+    fields, error = validate_fields(request.args.get('fields'), SPARSE_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    contents = Content.query.options(*Content.listing_options(fields))\
+        .filter(Content.id.in_(ids), Content.status == 'approved')\
+        .all()
+    found = dict(zip([content.id for content in contents], Content.to_dict_list(contents, fields=fields)))
+    
+    # Requested order, with a marker for ids that are missing or not published
+    return jsonify({
+        'content': [found.get(content_id, {'id': content_id, 'error': 'Content not found'})
+                    for content_id in ids]
+    }), 200
+
+@user_bp.route('/content/viewer-state', methods=['GET'])
+@jwt_required()
+@active_user_required
+def get_content_viewer_state():
+    """Get the current user's review and wishlist state for a list of content ids"""
+    current_user_id = get_jwt_identity()
     
-    # Order by most recent
-    pagination = query.order_by(Content.published_at.desc())\
-        .paginate(page=page, per_page=per_page, error_out=False)
+    ids, error = validate_id_list(request.args.get('ids'), current_app.config['VIEWER_STATE_MAX_IDS'])
+    if error:
+        return jsonify({'error': error}), 400
     
     return jsonify({
-        'content': [content.to_dict() for content in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        'states': get_viewer_states(current_user_id, ids)
     }), 200
 
 @user_bp.route('/content/<int:content_id>', methods=['GET'])
+@conditional_response(
+    Content.validators,
+    on_not_modified=lambda content_id: view_counter.record(content_id)
+)
+@cache.cached_response(
+    tags=lambda content_id: ['content', f'content:{content_id}'],
+    on_hit=lambda content_id: view_counter.record(content_id)
+)
 def get_content_detail(content_id):
     """Get single content with full details"""
     content = Content.query.get(content_id)
@@ -73,11 +193,56 @@ def get_content_detail(content_id):
         except:
             return jsonify({'error': 'Content not available'}), 404
     
-    # Increment view count
+    # Views are buffered, so this request does not write to the database.
+    # Report the stored count plus unflushed views, including this one.
+    views_count = (content.views_count or 0) + view_counter.pending(content.id) + 1
+    content.increment_views()
+    
+    data = content.to_dict(include_body=True)
+    data['views_count'] = views_count
+    
+    return jsonify({
+        'content': data
+    }), 200
+
+@user_bp.route('/content/<int:content_id>/page', methods=['GET'])
+@jwt_required(optional=True)
+def get_content_page(content_id):
+    """Get everything an article page renders: detail, first comments page and viewer state"""
+    comments_per_page = min(request.args.get('comments_per_page', 20, type=int), 100)
+    if comments_per_page < 1:
+        return jsonify({'error': 'comments_per_page must be at least 1'}), 400
+    
+    current_user_id = get_jwt_identity()
+    
+    content = Content.query.options(db.joinedload(Content.author), db.joinedload(Content.category))\
+        .filter_by(id=content_id)\
+        .first()
+    
+    if not content:
+        return jsonify({'error': 'Content not found'}), 404
+    
+    viewer = get_viewer_state(current_user_id, content_id)
+    
+    # Only show approved content to non-authors
+    if content.status != 'approved' and (viewer is None or content.author_id != current_user_id):
+        return jsonify({'error': 'Content not available'}), 404
+    
+    views_count = (content.views_count or 0) + view_counter.pending(content.id) + 1
     content.increment_views()
     
+    data = content.to_dict(include_body=True)
+    data['views_count'] = views_count
+    
+    thread = get_thread_page(content_id, per_page=comments_per_page)
+    
     return jsonify({
-        'content': content.to_dict(include_body=True)
+        'content': data,
+        'comments': thread['comments'],
+        'comments_total': content.comments_count,
+        'has_more_comments': thread['has_more'],
+        'comments_next_cursor': thread['next_cursor'],
+        'viewer': viewer
     }), 200
 
 # ==================== USER CONTENT CREATION ====================
@@ -163,7 +328,10 @@ def create_comment(content_id):
     
     try:
         db.session.add(comment)
+        comment.increment_counters()
         db.session.commit()
+        cache.invalidate(f'content:{content_id}')
+        invalidate_thread(content_id)
         
         return jsonify({
             'message': 'Comment created successfully',
@@ -175,21 +343,56 @@ def create_comment(content_id):
 
 @user_bp.route('/content/<int:content_id>/comments', methods=['GET'])
 def get_comments(content_id):
-    """Get all comments for content with threading"""
+    """Get a page of top-level comments with the newest replies under each"""
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    replies_per_parent = min(request.args.get('replies_per_parent', 3, type=int), 20)
+    
+    if per_page < 1 or replies_per_parent < 1:
+        return jsonify({'error': 'per_page and replies_per_parent must be at least 1'}), 400
+    
     content = Content.query.get(content_id)
     
     if not content:
         return jsonify({'error': 'Content not found'}), 404
     
-    # Get only top-level comments (no parent)
-    top_level_comments = Comment.query.filter_by(
-        content_id=content_id,
-        parent_comment_id=None
-    ).order_by(Comment.created_at.desc()).all()
+    try:
+        thread = get_thread_page(content_id, cursor=request.args.get('cursor'), per_page=per_page,
+                                 replies_per_parent=replies_per_parent)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     return jsonify({
-        'comments': [comment.to_dict(include_replies=True) for comment in top_level_comments],
-        'total': content.comments.count()
+        'comments': thread['comments'],
+        'next_cursor': thread['next_cursor'],
+        'prev_cursor': thread['prev_cursor'],
+        'total': content.comments_count
+    }), 200
+
+@user_bp.route('/comments/<int:comment_id>/replies', methods=['GET'])
+def get_comment_replies(comment_id):
+    """Get more replies of a comment, continuing from its replies_cursor"""
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    replies_per_parent = min(request.args.get('replies_per_parent', 3, type=int), 20)
+    
+    if per_page < 1 or replies_per_parent < 1:
+        return jsonify({'error': 'per_page and replies_per_parent must be at least 1'}), 400
+    
+    comment = Comment.query.get(comment_id)
+    
+    if not comment:
+        return jsonify({'error': 'Comment not found'}), 404
+    
+    try:
+        page = comment.get_replies_page(cursor=request.args.get('cursor'), per_page=per_page,
+                                        replies_per_parent=replies_per_parent)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    return jsonify({
+        'replies': page['replies'],
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+        'total': comment.replies_count
     }), 200
 
 @user_bp.route('/comments/<int:comment_id>', methods=['PUT'])
@@ -214,6 +417,8 @@ def update_comment(comment_id):
     
     try:
         db.session.commit()
+        invalidate_thread(comment.content_id)
+        
         return jsonify({
             'message': 'Comment updated successfully',
             'comment': comment.to_dict()
@@ -237,8 +442,11 @@ def delete_comment(comment_id):
         return jsonify({'error': 'Unauthorized to delete this comment'}), 403
     
     try:
-        db.session.delete(comment)
+        content_id = comment.content_id
+        comment.delete_subtree()
         db.session.commit()
+        cache.invalidate(f'content:{content_id}')
+        invalidate_thread(content_id)
         
         return jsonify({
             'message': 'Comment deleted successfully'
@@ -393,6 +601,7 @@ def add_to_wishlist():
     try:
         db.session.add(wishlist)
         db.session.commit()
+        invalidate_viewer_state(current_user_id)
         
         return jsonify({
             'message': 'Added to wishlist',
@@ -410,16 +619,41 @@ def get_wishlist():
     current_user_id = get_jwt_identity()
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count = request.args.get('count', 'exact')
+    cursor = request.args.get('cursor')
+    
+    fields, error = validate_fields(request.args.get('fields'), SPARSE_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    query = Wishlist.query.options(*Wishlist.listing_options(fields)).filter_by(user_id=current_user_id)
+    
+    if cursor is not None:
+        try:
+            page_data = keyset_paginate(query, Wishlist.created_at, Wishlist.id,
+                                        cursor=cursor, per_page=per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return jsonify({
+            'wishlist': Wishlist.to_dict_list(page_data['items'], fields=fields),
+            'next_cursor': page_data['next_cursor'],
+            'prev_cursor': page_data['prev_cursor']
+        }), 200
     
-    pagination = Wishlist.query.filter_by(user_id=current_user_id)\
-        .order_by(Wishlist.created_at.desc())\
-        .paginate(page=page, per_page=per_page, error_out=False)
+    if count not in COUNT_MODES:
+        return jsonify({'error': "count must be 'exact', 'estimate' or 'none'"}), 400
+    
+    page_data = offset_paginate(query.order_by(Wishlist.created_at.desc()),
+                                page=page, per_page=per_page, count=count)
     
     return jsonify({
-        'wishlist': [item.to_dict(include_content=True) for item in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        'wishlist': Wishlist.to_dict_list(page_data['items'], fields=fields),
+        'total': page_data['total'],
+        'total_exact': page_data['total_exact'],
+        'pages': page_data['pages'],
+        'current_page': page,
+        'has_next': page_data['has_next']
     }), 200
 
 @user_bp.route('/wishlist/<int:wishlist_id>', methods=['DELETE'])
@@ -440,6 +674,7 @@ def remove_from_wishlist(wishlist_id):
     try:
         db.session.delete(wishlist)
         db.session.commit()
+        invalidate_viewer_state(current_user_id)
         
         return jsonify({
             'message': 'Removed from wishlist'
@@ -465,29 +700,17 @@ def review_content(content_id):
     if not data.get('review_type') or data['review_type'] not in ['like', 'dislike']:
         return jsonify({'error': 'Invalid review type'}), 400
     
-    # Check if user already reviewed
-    existing_review = ContentReview.query.filter_by(
-        content_id=content_id,
-        user_id=current_user_id
-    ).first()
-    
     try:
-        if existing_review:
-            # Update existing review
-            existing_review.review_type = data['review_type']
-        else:
-            # Create new review
-            review = ContentReview(
-                content_id=content_id,
-                user_id=current_user_id,
-                review_type=data['review_type']
-            )
-            db.session.add(review)
+        # Insert or change the review in one statement
+        previous_type, new_type = ContentReview.upsert(
+            content_id, current_user_id, data['review_type']
+        )
         
+        # Update content counts in the same transaction
+        ContentReview.apply_count_change(content_id, previous_type, new_type)
         db.session.commit()
-        
-        # Update content counts
-        ContentReview.update_content_counts(content_id)
+        cache.invalidate(f'content:{content_id}')
+        invalidate_viewer_state(current_user_id)
         
         return jsonify({
             'message': 'Review submitted successfully'
@@ -506,30 +729,54 @@ def get_recommendations():
     current_user_id = get_jwt_identity()
     limit = request.args.get('limit', 10, type=int)
     
-    # Get user's subscribed categories
-    subscriptions = Subscription.query.filter_by(user_id=current_user_id).all()
-    subscribed_category_ids = [sub.category_id for sub in subscriptions]
+    fields, error = validate_fields(request.args.get('fields'), SPARSE_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
     
-    if not subscribed_category_ids:
-        # No subscriptions, return popular content
-        recommendations = Content.query.filter_by(status='approved')\
-            .order_by(desc(Content.views_count))\
-            .limit(limit).all()
-    else:
-        # Get content from subscribed categories
-        recommendations = Content.query\
+    # Items similar to what the user liked or wishlisted (see ContentNeighbor)
+    recommendations = ContentNeighbor.recommended_query(current_user_id)\
+        .options(*Content.listing_options(fields))\
+        .limit(limit).all()
+    
+    if len(recommendations) < limit:
+        # Fill up from subscribed categories, or popular content
+        subscriptions = Subscription.query.filter_by(user_id=current_user_id).all()
+        subscribed_category_ids = [sub.category_id for sub in subscriptions]
+        
+        fallback = Content.query.options(*Content.listing_options(fields))\
             .filter(Content.status == 'approved')\
-            .filter(Content.category_id.in_(subscribed_category_ids))\
-            .order_by(desc(Content.published_at))\
-            .limit(limit).all()
+            .filter(Content.id.not_in([content.id for content in recommendations]))
+        
+        if not subscribed_category_ids:
+            fallback = fallback.order_by(desc(Content.views_count))
+        else:
+            fallback = fallback.filter(Content.category_id.in_(subscribed_category_ids))\
+                .order_by(desc(Content.published_at))
+        
+        recommendations += fallback.limit(limit - len(recommendations)).all()
+    
+    return jsonify({
+        'recommendations': Content.to_dict_list(recommendations, fields=fields)
+    }), 200
+
+# ==================== TAGS ====================
+
+@user_bp.route('/tags', methods=['GET'])
+def get_tags():
+    """Get tags used by published content with their frequencies"""
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
     
     return jsonify({
-        'recommendations': [content.to_dict() for content in recommendations]
+        'tags': Content.tag_counts(limit)
     }), 200
 
 # ==================== CATEGORIES ====================
 
 @user_bp.route('/categories', methods=['GET'])
+@conditional_response(Category.validators)
+@cache.cached_response(tags=['categories'])
 def get_categories():
     """Get all categories"""
     categories = Category.query.order_by(Category.name).all()
@@ -539,6 +786,8 @@ def get_categories():
     }), 200
 
 @user_bp.route('/categories/<int:category_id>', methods=['GET'])
+@conditional_response(Category.validators)
+@cache.cached_response(tags=['categories'])
 def get_category(category_id):
     """Get category details"""
     category = Category.query.get(category_id)
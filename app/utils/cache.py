@@ -0,0 +1,351 @@
+"""
+Tag-invalidated cache for public responses and derived data
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, g, request, make_response
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry TTL and tag index"""
+
+    shared = False  # each worker process has its own entries
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags=()):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """
+    Redis cache shared by all workers on a host
+
+    Tags are Redis sets of the keys carrying them. Connection problems are
+    logged and treated as cache misses so Redis is never a hard dependency.
+    """
+
+    shared = True
+
+    def __init__(self, url, prefix='moringa:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND='redis' requires the 'redis' package")
+
+        self._errors = redis.RedisError
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        try:
+            return self.client.get(self.prefix + key)
+        except self._errors:
+            logger.warning("Redis cache get failed", exc_info=True)
+            return None
+
+    def set(self, key, value, ttl, tags=()):
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self.prefix + key, value, ex=ttl)
+            for tag in tags:
+                tag_key = f'{self.prefix}tag:{tag}'
+                pipe.sadd(tag_key, self.prefix + key)
+                pipe.expire(tag_key, ttl)
+            pipe.execute()
+        except self._errors:
+            logger.warning("Redis cache set failed", exc_info=True)
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except self._errors:
+            logger.warning("Redis cache delete failed", exc_info=True)
+
+    def invalidate(self, tags):
+        try:
+            for tag in tags:
+                tag_key = f'{self.prefix}tag:{tag}'
+                keys = self.client.smembers(tag_key)
+                self.client.delete(tag_key, *keys)
+        except self._errors:
+            logger.warning("Redis cache invalidation failed", exc_info=True)
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except self._errors:
+            logger.warning("Redis cache clear failed", exc_info=True)
+
+
+class CacheStats:
+    """Per-process hit and miss counts by key namespace (the text before the first ':')"""
+
+    def __init__(self):
+        self._counts = {}  # namespace -> [hits, misses]
+        self._lock = threading.Lock()
+
+    def record(self, key, hit):
+        namespace = key.split(':', 1)[0]
+        with self._lock:
+            counts = self._counts.setdefault(namespace, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self):
+        """Counts and hit rate per namespace"""
+        with self._lock:
+            counts = {namespace: tuple(pair) for namespace, pair in self._counts.items()}
+
+        return {
+            namespace: {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None
+            }
+            for namespace, (hits, misses) in sorted(counts.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+class Cache:
+    """
+    Pluggable cache selected by config
+
+    Two backends: the main one holds responses and per-user state, and the
+    aggregate one holds derived aggregates (tag counts, facets) that may lag
+    by up to the TTL. get/set pick one with aggregate=True; invalidate and
+    clear act on both.
+
+    Config:
+        CACHE_BACKEND: 'memory' (per process), 'redis' (shared) or 'null' (off)
+        AGGREGATE_CACHE_BACKEND: Backend for aggregates; defaults to the main
+            backend, or to 'memory' when the main one is 'null'
+        CACHE_REDIS_URL: Redis URL for the redis backend
+        CACHE_DEFAULT_TTL: Seconds an entry lives unless invalidated sooner
+        CACHE_MAX_ENTRIES: Capacity of the memory backend
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Create the configured backends for an app"""
+        kind = app.config.get('CACHE_BACKEND', 'memory')
+        backend = self._create_backend(app, kind)
+
+        aggregate_kind = app.config.get('AGGREGATE_CACHE_BACKEND')
+        if aggregate_kind is None:
+            aggregate_kind = 'memory' if kind == 'null' else kind
+        if aggregate_kind == kind:
+            aggregate_backend = backend
+        else:
+            aggregate_backend = self._create_backend(app, aggregate_kind)
+
+        app.extensions['cache'] = backend
+        app.extensions['aggregate_cache'] = aggregate_backend
+        app.extensions['cache_stats'] = CacheStats()
+
+    @staticmethod
+    def _create_backend(app, kind):
+        if kind == 'memory':
+            return MemoryCacheBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        if kind == 'redis':
+            return RedisCacheBackend(app.config.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+        if kind == 'null':
+            return None
+        raise ValueError(f'Unknown cache backend: {kind}')
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('cache')
+
+    @property
+    def aggregate_backend(self):
+        return current_app.extensions.get('aggregate_cache')
+
+    def _backends(self):
+        """Distinct configured backends"""
+        backends = []
+        for backend in (self.backend, self.aggregate_backend):
+            if backend is not None and all(backend is not other for other in backends):
+                backends.append(backend)
+        return backends
+
+    @property
+    def default_ttl(self):
+        return current_app.config.get('CACHE_DEFAULT_TTL', 60)
+
+    @property
+    def shared(self):
+        """
+        Whether every worker sees the same entries and invalidations
+
+        Per-user state must be read-your-writes: a write handled by one
+        worker can only drop per-process entries of that worker, so such
+        state is cached only when this is True.
+        """
+        backend = self.backend
+        return backend is not None and backend.shared
+
+    @property
+    def stats(self):
+        return current_app.extensions['cache_stats']
+
+    def get(self, key, aggregate=False):
+        """Get a cached value (bytes), or None"""
+        backend = self.aggregate_backend if aggregate else self.backend
+        if backend is None:
+            return None
+
+        value = backend.get(key)
+        self.stats.record(key, value is not None)
+        return value
+
+    def set(self, key, value, ttl=None, tags=(), aggregate=False):
+        """Cache a bytes value under the given tags"""
+        backend = self.aggregate_backend if aggregate else self.backend
+        if backend is not None:
+            backend.set(key, value, ttl or self.default_ttl, tags)
+
+    def delete(self, key):
+        """Drop a single cached value"""
+        for backend in self._backends():
+            backend.delete(key)
+
+    def invalidate(self, *tags):
+        """Drop every cached value carrying any of the tags"""
+        if tags:
+            for backend in self._backends():
+                backend.invalidate(tags)
+
+    def clear(self):
+        """Drop everything"""
+        for backend in self._backends():
+            backend.clear()
+
+    @staticmethod
+    def request_key():
+        """
+        Cache key for the current request: path plus sorted query args
+
+        Under conditional_response the current ETag is part of the key, so
+        a write that moves the validators but not the cache tags (a like,
+        a comment) cannot leave a new ETag paired with the old body.
+        """
+        args = sorted(
+            (name, value)
+            for name in request.args
+            for value in request.args.getlist(name)
+        )
+        key = f'response:{request.path}?{urlencode(args)}'
+        etag = g.get('etag')
+        return f'{key}#{etag}' if etag else key
+
+    def cached_response(self, tags, ttl=None, on_hit=None):
+        """
+        Cache successful anonymous GET responses of a view
+
+        Args:
+            tags: List of tags, or a callable taking the view kwargs and
+                returning one
+            ttl: Seconds to keep the response (defaults to CACHE_DEFAULT_TTL)
+            on_hit: Optional callable run with the view kwargs when a cached
+                response is served, for side effects the view would have had
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                # Authenticated callers may see private data; never share it
+                if self.backend is None or request.headers.get('Authorization'):
+                    return fn(*args, **kwargs)
+
+                key = self.request_key()
+                body = self.get(key)
+                if body is not None:
+                    if on_hit is not None:
+                        on_hit(**kwargs)
+                    response = current_app.response_class(body, status=200, mimetype='application/json')
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code == 200:
+                    entry_tags = tags(**kwargs) if callable(tags) else tags
+                    self.set(key, response.get_data(), ttl, entry_tags)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+
+cache = Cache()
+
+
+def invalidate_content(content_id):
+    """Drop cached public responses that may include a content item"""
+    cache.invalidate('content-list', f'content:{content_id}', f'comments:{content_id}', 'categories')
+
+
+def invalidate_categories():
+    """Drop cached category responses and content embedding category data"""
+    cache.invalidate('categories', 'content')
@@ -0,0 +1,70 @@
+"""
+Flask CLI maintenance commands
+"""
+import click
+from flask.cli import with_appcontext
+from app.models.content_neighbor import NEIGHBORS_PER_ITEM, MIN_CO_USERS
+
+
+@click.command('recount-comments')
+@with_appcontext
+def recount_comments_command():
+    """Recompute denormalized comment and reply counters."""
+    from app.models.content import Content
+    from app.models.comment import Comment
+    
+    fixed_content = Content.recount_comments()
+    fixed_comments = Comment.recount_replies()
+    
+    click.echo(f'Fixed comments_count on {fixed_content} content item(s)')
+    click.echo(f'Fixed replies_count on {fixed_comments} comment(s)')
+
+
+@click.command('recount-reviews')
+@with_appcontext
+def recount_reviews_command():
+    """Recompute like and dislike counters from content reviews."""
+    from app.models.content_review import ContentReview
+    
+    fixed = ContentReview.recount_all_content_counts()
+    
+    click.echo(f'Fixed like/dislike counts on {fixed} content item(s)')
+
+
+@click.command('refresh-scores')
+@with_appcontext
+def refresh_scores_command():
+    """Recompute hot and top-of-the-week feed scores (run from cron)."""
+    from app.models.content import Content
+    from app.utils.cache import cache
+    
+    updated = Content.refresh_scores()
+    # A per-process cache lives in the web workers, out of reach of this
+    # process; their cached feeds expire after CACHE_DEFAULT_TTL instead
+    if updated and cache.shared:
+        cache.invalidate('content-list')
+    
+    click.echo(f'Updated scores on {updated} content item(s)')
+
+
+@click.command('build-recommendations')
+@click.option('--neighbors', default=NEIGHBORS_PER_ITEM, show_default=True, type=click.IntRange(min=1),
+              help='Neighbors kept per content item.')
+@click.option('--min-co-users', default=MIN_CO_USERS, show_default=True, type=click.IntRange(min=1),
+              help='Users two items must share.')
+@with_appcontext
+def build_recommendations_command(neighbors, min_co_users):
+    """Rebuild item-to-item recommendation neighbors from likes and wishlists (run from cron)."""
+    from app.models.content_neighbor import ContentNeighbor
+    
+    written = ContentNeighbor.rebuild(neighbors_per_item=neighbors, min_co_users=min_co_users)
+    
+    click.echo(f'Stored {written} neighbor pair(s)')
+
+
+def register_commands(app):
+    """Register all CLI commands with the Flask app"""
+    app.cli.add_command(recount_comments_command)
+    app.cli.add_command(recount_reviews_command)
+    app.cli.add_command(refresh_scores_command)
+    app.cli.add_command(build_recommendations_command)
@@ -0,0 +1,54 @@
+"""
+Cached comment thread pages, one tag per content item
+"""
+import json
+from app.models.comment import Comment
+from app.utils.cache import cache
+
+
+def thread_tag(content_id):
+    """Cache tag carried by every cached thread page of a content item"""
+    return f'comments:{content_id}'
+
+
+def get_thread_page(content_id, cursor=None, per_page=20, replies_per_parent=3):
+    """
+    Serialized comment thread page, cached until the thread changes
+
+    Pages are cached per content id and page parameters, only when the
+    cache backend is shared: a comment write can only invalidate the
+    per-process cache of the worker that handled it, and its author would
+    not see it on a reload served by another worker. Lookups are counted
+    under the 'comments' namespace of the cache stats.
+
+    Args:
+        content_id: ID of the content
+        cursor: Cursor from a previous page, or None for the newest comments
+        per_page: Number of top-level comments
+        replies_per_parent: Newest replies shown under each comment
+
+    Returns:
+        dict: As Comment.get_thread_page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cache.shared:
+        return Comment.get_thread_page(content_id, cursor=cursor, per_page=per_page,
+                                       replies_per_parent=replies_per_parent)
+
+    key = f'comments:{content_id}:' + json.dumps([cursor, per_page, replies_per_parent])
+
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    thread = Comment.get_thread_page(content_id, cursor=cursor, per_page=per_page,
+                                     replies_per_parent=replies_per_parent)
+    cache.set(key, json.dumps(thread).encode('utf-8'), tags=[thread_tag(content_id)])
+    return thread
+
+
+def invalidate_thread(content_id):
+    """Drop every cached page of a content item's comment thread"""
+    cache.invalidate(thread_tag(content_id))
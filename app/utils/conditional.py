@@ -0,0 +1,71 @@
+"""
+Conditional GET support (ETag / Last-Modified)
+"""
+import hashlib
+from functools import wraps
+from flask import current_app, g, request, make_response
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts):
+    """
+    Build an opaque ETag value from the parts that identify a representation
+
+    Args:
+        *parts: Values such as ids, counts and timestamps
+
+    Returns:
+        str: Hex digest (unquoted)
+    """
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def latest(*timestamps):
+    """Most recent of the given timestamps, ignoring None"""
+    present = [ts for ts in timestamps if ts is not None]
+    return max(present) if present else None
+
+
+def conditional_response(validators, on_not_modified=None):
+    """
+    Answer If-None-Match / If-Modified-Since before the view runs
+
+    The validators are computed from a cheap query (a primary key lookup or
+    a max(updated_at) watermark), so a matching request gets a 304 without
+    loading or serializing the full result. The ETag is left in g.etag so a
+    response cache below can key on it and never pair it with an older body.
+
+    Args:
+        validators: Callable taking the view kwargs and returning
+            (etag, last_modified), or None to skip conditional handling
+            (e.g. the resource does not exist or is not public)
+        on_not_modified: Optional callable run with the view kwargs when a
+            304 is returned, for side effects the view would have had
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = validators(**kwargs)
+            if result is None:
+                return fn(*args, **kwargs)
+
+            etag, last_modified = result
+            g.etag = etag
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                if on_not_modified is not None:
+                    on_not_modified(**kwargs)
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Weak: counters in the body may lag the stored row slightly
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
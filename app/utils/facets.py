@@ -0,0 +1,126 @@
+"""
+Faceted counts for the content browser
+"""
+import json
+from sqlalchemy import func, distinct, true
+from app import db
+from app.models.content import Content
+from app.models.category import Category
+from app.utils.cache import cache
+from app.utils.search import apply_search
+
+
+def normalize_filters(category_id=None, content_type=None, search=None, tags=None, tag_match='any'):
+    """
+    Canonical form of the content browser filters
+
+    Equivalent filters (tag order, duplicate tags, letter case and spacing in
+    the search text) normalize to the same dict, so they share a cache entry.
+
+    Returns:
+        dict: Normalized filters
+    """
+    search = ' '.join(search.lower().split()) if search else None
+    tags = sorted(set(tags or []))
+
+    return {
+        'category_id': category_id or None,
+        'content_type': content_type or None,
+        'search': search or None,
+        'tags': tags,
+        'tag_match': tag_match if tags else None
+    }
+
+
+def filtered_content(filters):
+    """Approved content matching normalized filters"""
+    query = Content.query.filter(Content.status == 'approved')
+
+    if filters['category_id']:
+        query = query.filter(Content.category_id == filters['category_id'])
+    if filters['content_type']:
+        query = query.filter(Content.content_type == filters['content_type'])
+    if filters['tags']:
+        query = Content.filter_by_tags(query, filters['tags'], match=filters['tag_match'])
+    if filters['search']:
+        query, _ = apply_search(query, filters['search'])
+
+    return query
+
+
+def compute_facets(filters):
+    """
+    Count matching content per category, content type and tag
+
+    One GROUPING SETS query over the filtered rows, with tags unnested by a
+    lateral join. Counting distinct ids keeps the category and type counts
+    right although each item appears once per tag.
+
+    Args:
+        filters: Normalized filters (see normalize_filters)
+
+    Returns:
+        dict: Total and per-facet counts
+    """
+    rows = filtered_content(filters)\
+        .with_entities(Content.id, Content.category_id, Content.content_type, Content.tags)\
+        .order_by(None)\
+        .subquery()
+    # Set-returning functions in FROM see earlier FROM items, i.e. are lateral
+    tag = func.unnest(rows.c.tags).table_valued('tag').render_derived(name='item_tags')
+
+    category_group = (rows.c.category_id, Category.name, Category.slug)
+    is_category = func.grouping(rows.c.category_id) == 0
+    is_type = func.grouping(rows.c.content_type) == 0
+
+    result = db.session.query(
+        rows.c.category_id, Category.name, Category.slug, rows.c.content_type, tag.c.tag,
+        is_category.label('is_category'), is_type.label('is_type'),
+        func.count(distinct(rows.c.id)).label('count')
+    ).select_from(rows)\
+        .join(Category, Category.id == rows.c.category_id)\
+        .outerjoin(tag, true())\
+        .group_by(func.grouping_sets(
+            db.tuple_(*category_group), db.tuple_(rows.c.content_type), db.tuple_(tag.c.tag)
+        ))\
+        .all()
+
+    categories, content_types, tags = [], [], []
+    for row in result:
+        if row.is_category:
+            categories.append({'id': row.category_id, 'name': row.name, 'slug': row.slug, 'count': row.count})
+        elif row.is_type:
+            content_types.append({'content_type': row.content_type, 'count': row.count})
+        elif row.tag is not None:
+            tags.append({'tag': row.tag, 'count': row.count})
+
+    return {
+        'total': sum(item['count'] for item in categories),
+        'categories': _most_common(categories, 'name'),
+        'content_types': _most_common(content_types, 'content_type'),
+        'tags': _most_common(tags, 'tag')
+    }
+
+
+def _most_common(items, label):
+    return sorted(items, key=lambda item: (-item['count'], item[label]))
+
+
+def get_facets(filters):
+    """
+    Faceted counts for normalized filters, cached per filter
+
+    Entries live in the aggregate cache and carry the content-list and
+    categories tags, so they are dropped when published content changes
+    status or a category changes (on a per-process cache, only in the worker
+    that made the change; the others catch up within the TTL).
+    """
+    key = 'facets:' + json.dumps(filters, sort_keys=True)
+
+    cached = cache.get(key, aggregate=True)
+    if cached is not None:
+        return json.loads(cached)
+
+    facets = compute_facets(filters)
+    cache.set(key, json.dumps(facets).encode('utf-8'), tags=['content-list', 'categories'], aggregate=True)
+    return facets
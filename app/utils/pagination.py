@@ -0,0 +1,258 @@
+"""
+Pagination utilities: keyset (cursor) pagination and offset pages with
+exact, estimated or no totals
+"""
+import base64
+import json
+import math
+from datetime import datetime
+from sqlalchemy import tuple_, and_, or_, func, DateTime
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+# In estimate mode totals up to this many rows are still counted exactly
+ESTIMATE_EXACT_UP_TO = 1000
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+def clamp_per_page(per_page):
+    """Page size to use: non-positive sizes fall back to the default, large ones are capped"""
+    if per_page is None or per_page < 1:
+        return DEFAULT_PER_PAGE
+    return min(per_page, MAX_PER_PAGE)
+
+
+def encode_cursor(value, row_id, direction='next'):
+    """
+    Encode a keyset position into an opaque cursor string
+
+    Args:
+        value: Sort column value of the boundary row
+        row_id: Primary key of the boundary row
+        direction: 'next' or 'prev'
+
+    Returns:
+        str: URL-safe cursor
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    payload = json.dumps([value, row_id, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_column):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+        sort_column: Column the cursor value belongs to (used to restore its type)
+
+    Returns:
+        tuple: (value, row_id, direction)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+        if value is not None and isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+
+        if not isinstance(row_id, int) or direction not in ('next', 'prev'):
+            raise ValueError
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+    return value, row_id, direction
+
+
+def _after(sort_column, id_column, value, row_id, descending):
+    """
+    Build the predicate selecting rows strictly after (value, row_id).
+
+    Orderings follow PostgreSQL defaults (DESC puts NULLs first, ASC puts them
+    last) so a plain b-tree index on (sort_column, id_column) serves both
+    directions.
+    """
+    if descending:
+        if value is None:
+            return or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.isnot(None)
+            )
+        return tuple_(sort_column, id_column) < tuple_(value, row_id)
+
+    if value is None:
+        return and_(sort_column.is_(None), id_column > row_id)
+    return or_(
+        tuple_(sort_column, id_column) > tuple_(value, row_id),
+        sort_column.is_(None)
+    )
+
+
+def keyset_paginate(query, sort_column, id_column, cursor=None, per_page=20,
+                    descending=True, key=None):
+    """
+    Paginate a query by (sort_column, id_column) without OFFSET or COUNT
+
+    Args:
+        query: SQLAlchemy query object (without ORDER BY)
+        sort_column: Column to order by
+        id_column: Unique tie-breaker column
+        cursor: Cursor from a previous page, or None/'' for the first page
+        per_page: Items per page (see clamp_per_page)
+        descending: Whether the listing is newest-first
+        key: Optional callable mapping an item to (sort_value, id); defaults
+            to reading the columns' attribute names off the item
+
+    Returns:
+        dict: Page items and navigation cursors
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    per_page = clamp_per_page(per_page)
+    if key is None:
+        key = lambda item: (getattr(item, sort_column.key), getattr(item, id_column.key))
+
+    direction = 'next'
+    if cursor:
+        value, row_id, direction = decode_cursor(cursor, sort_column)
+
+    # Walking backwards is a forward walk over the reversed ordering
+    forward = descending if direction == 'next' else not descending
+
+    if cursor:
+        query = query.filter(_after(sort_column, id_column, value, row_id, forward))
+
+    if forward:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    if direction == 'prev':
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(*key(items[-1]), direction='next')
+        if has_prev:
+            prev_cursor = encode_cursor(*key(items[0]), direction='prev')
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+        'has_next': has_next,
+        'has_prev': has_prev
+    }
+
+
+def planner_row_estimate(query):
+    """
+    Row count the PostgreSQL planner expects a query to return
+
+    Comes from table statistics (EXPLAIN without ANALYZE), so it costs a
+    planning pass rather than a scan.
+
+    Args:
+        query: SQLAlchemy query object
+
+    Returns:
+        int: Estimated number of rows
+    """
+    statement = query.order_by(None).statement
+    connection = query.session.connection()
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+
+    plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(query, mode='exact', exact_up_to=None):
+    """
+    Total rows of a query in the requested count mode
+
+    Args:
+        query: SQLAlchemy query object
+        mode: 'exact' runs COUNT(*); 'estimate' counts at most exact_up_to + 1
+            rows and falls back to the planner estimate beyond that; 'none'
+            skips counting
+        exact_up_to: Largest total the estimate mode still counts exactly
+            (defaults to ESTIMATE_EXACT_UP_TO)
+
+    Returns:
+        tuple: (total or None, whether the total is exact)
+    """
+    if mode == 'none':
+        return None, False
+
+    query = query.order_by(None)
+    if mode == 'exact':
+        return query.count(), True
+
+    if exact_up_to is None:
+        exact_up_to = ESTIMATE_EXACT_UP_TO
+
+    capped = query.session.query(func.count())\
+        .select_from(query.limit(exact_up_to + 1).subquery())\
+        .scalar()
+    if capped <= exact_up_to:
+        return capped, True
+
+    # At least exact_up_to + 1 rows exist, whatever the statistics say
+    return max(planner_row_estimate(query), capped), False
+
+
+def offset_paginate(query, page=1, per_page=20, count='exact'):
+    """
+    Paginate a query with LIMIT/OFFSET and a configurable total
+
+    Args:
+        query: SQLAlchemy query object (ordered)
+        page: Page number, starting at 1
+        per_page: Items per page (see clamp_per_page)
+        count: 'exact', 'estimate' or 'none' (see count_rows)
+
+    Returns:
+        dict: Page items, total, pages and navigation flags
+    """
+    page = max(page, 1)
+    per_page = clamp_per_page(per_page)
+
+    # One extra row tells whether a next page exists without a count
+    items = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+
+    if count != 'none' and page == 1 and not has_next:
+        # The whole result fits on the first page
+        total, exact = len(items), True
+    else:
+        total, exact = count_rows(query, count)
+
+    return {
+        'items': items,
+        'total': total,
+        'total_exact': exact,
+        'pages': math.ceil(total / per_page) if total is not None else None,
+        'has_next': has_next,
+        'has_prev': page > 1
+    }
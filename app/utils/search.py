@@ -0,0 +1,66 @@
+"""
+Full-text search helpers for content
+"""
+import re
+from sqlalchemy import func, or_, select
+from app.models.content import Content
+
+SEARCH_CONFIG = 'english'
+
+# Letters and digits only; anything else would be tsquery syntax
+_TOKEN_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+def build_tsquery(term):
+    """
+    Build a prefix-matching tsquery from free text
+
+    Every word must match; the last one is treated as a prefix so results
+    update sensibly while the user is still typing.
+
+    Args:
+        term: Raw search text
+
+    Returns:
+        Tsquery SQL expression, or None if the text has no searchable words.
+        The expression can still be empty when every word is a stop word
+        (see apply_search).
+    """
+    tokens = _TOKEN_PATTERN.findall(term.lower())
+    if not tokens:
+        return None
+
+    tokens[-1] = f'{tokens[-1]}:*'
+    return func.to_tsquery(SEARCH_CONFIG, ' & '.join(tokens))
+
+
+def apply_search(query, term):
+    """
+    Filter a content query by a search term
+
+    Falls back to a substring match when the text gives the index nothing to
+    match on: only punctuation, or only stop words ('the', or 'a' as the
+    first keystroke), which to_tsquery reduces to an empty query. Whether the
+    tsquery is empty is a table-free SELECT numnode(...), so the full-text
+    branch keeps its plain @@ predicate and GIN index.
+
+    Args:
+        query: Content query object
+        term: Raw search text
+
+    Returns:
+        tuple: (filtered query, rank expression or None)
+    """
+    tsquery = build_tsquery(term)
+
+    if tsquery is None or not query.session.scalar(select(func.numnode(tsquery))):
+        search_term = f'%{term}%'
+        return query.filter(
+            or_(
+                Content.title.ilike(search_term),
+                Content.description.ilike(search_term)
+            )
+        ), None
+
+    rank = func.ts_rank(Content.search_vector, tsquery)
+    return query.filter(Content.search_vector.op('@@')(tsquery)), rank
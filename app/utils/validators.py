@@ -5,6 +5,8 @@ import re
 from functools import wraps
 from flask import request, jsonify
 
+MAX_DB_ID = 2147483647  # ids are PostgreSQL integer (int4) columns
+
 def validate_email(email):
     """
     Validate email format
@@ -187,6 +189,60 @@ def validate_pagination(page, per_page, max_per_page=100):
     
     return page, per_page, error
 
+def validate_fields(fields, allowed):
+    """
+    Validate a comma-separated sparse fieldset (?fields=title,author)
+    
+    Args:
+        fields: Raw query parameter value, or None
+        allowed: Field names the endpoint can return
+        
+    Returns:
+        tuple: (fields, error_message) - fields is None when not requested
+    """
+    if not fields:
+        return None, None
+    
+    requested = []
+    for name in fields.split(','):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+    
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        return None, f"Unknown field(s): {', '.join(unknown)}"
+    
+    return requested, None
+
+def validate_id_list(ids, max_ids):
+    """
+    Validate a comma-separated list of ids (?ids=3,1,2)
+    
+    Args:
+        ids: Raw query parameter value, or None
+        max_ids: Maximum number of distinct ids accepted
+        
+    Returns:
+        tuple: (ids, error_message) - ids are de-duplicated, in request order
+    """
+    if not ids:
+        return None, "ids is required"
+    
+    parsed = []
+    for value in ids.split(','):
+        value = value.strip()
+        # str.isdigit() also accepts non-ASCII digits such as '²'
+        if not re.match(r'^[0-9]+$', value) or not 1 <= int(value) <= MAX_DB_ID:
+            return None, f"Invalid id: {value or '(empty)'}"
+        if int(value) not in parsed:
+            parsed.append(int(value))
+    
+    if len(parsed) > max_ids:
+        return None, f"At most {max_ids} ids can be requested at once"
+    
+    return parsed, None
+
 def sanitize_input(text, max_length=None):
     """
     Sanitize text input
@@ -0,0 +1,103 @@
+"""
+Per-user state shown alongside content: the viewer's review and wishlist entry
+"""
+import json
+from app import db
+from app.models.user import User
+from app.models.content_review import ContentReview
+from app.models.wishlist import Wishlist
+from app.utils.cache import cache
+
+
+def get_viewer_state(user_id, content_id):
+    """
+    The caller's review type and wishlist entry for one content item
+
+    A single query: both lookups are correlated scalar subqueries on the
+    user's row, which also tells whether the account is still active.
+
+    Args:
+        user_id: ID of the authenticated user, or None
+        content_id: ID of the content
+
+    Returns:
+        dict: review_type, in_wishlist and wishlist_id, or None for
+            anonymous, unknown or deactivated users
+    """
+    if user_id is None:
+        return None
+
+    review_type = db.select(ContentReview.review_type)\
+        .where(ContentReview.user_id == User.id, ContentReview.content_id == content_id)\
+        .scalar_subquery()
+    wishlist_id = db.select(Wishlist.id)\
+        .where(Wishlist.user_id == User.id, Wishlist.content_id == content_id)\
+        .scalar_subquery()
+
+    row = db.session.execute(
+        db.select(User.is_active, review_type.label('review_type'), wishlist_id.label('wishlist_id'))
+        .where(User.id == user_id)
+    ).first()
+
+    if row is None or not row.is_active:
+        return None
+
+    return {
+        'review_type': row.review_type,
+        'in_wishlist': row.wishlist_id is not None,
+        'wishlist_id': row.wishlist_id
+    }
+
+
+def get_viewer_states(user_id, content_ids):
+    """
+    The caller's review type and wishlist entry for many content items
+
+    Two IN queries, each served by the (user_id, content_id) unique index
+    of its table. With a shared cache backend, results are cached per user
+    and id set until the user reviews or wishlists something (see
+    invalidate_viewer_state). A per-process cache could keep serving a
+    user's state from before their own write, so then nothing is cached.
+
+    Args:
+        user_id: ID of the authenticated user
+        content_ids: Content ids, in the order they should be returned
+
+    Returns:
+        list: One dict per id with content_id, review_type, in_wishlist and wishlist_id
+    """
+    key = f'viewer-state:{user_id}:' + ','.join(str(content_id) for content_id in sorted(content_ids))
+    shared = cache.shared
+
+    cached = cache.get(key) if shared else None
+    if cached is not None:
+        states = json.loads(cached)
+    else:
+        reviews = db.session.query(ContentReview.content_id, ContentReview.review_type)\
+            .filter(ContentReview.user_id == user_id, ContentReview.content_id.in_(content_ids))\
+            .all()
+        wishlist = db.session.query(Wishlist.content_id, Wishlist.id)\
+            .filter(Wishlist.user_id == user_id, Wishlist.content_id.in_(content_ids))\
+            .all()
+        # JSON object keys are strings, so key by str(id) in both code paths
+        states = {
+            'reviews': {str(content_id): review_type for content_id, review_type in reviews},
+            'wishlist': {str(content_id): wishlist_id for content_id, wishlist_id in wishlist}
+        }
+        if shared:
+            cache.set(key, json.dumps(states).encode('utf-8'), tags=[f'viewer:{user_id}'])
+
+    return [
+        {
+            'content_id': content_id,
+            'review_type': states['reviews'].get(str(content_id)),
+            'in_wishlist': str(content_id) in states['wishlist'],
+            'wishlist_id': states['wishlist'].get(str(content_id))
+        }
+        for content_id in content_ids
+    ]
+
+
+def invalidate_viewer_state(user_id):
+    """Drop cached viewer state after a user's reviews or wishlist change"""
+    cache.invalidate(f'viewer:{user_id}')
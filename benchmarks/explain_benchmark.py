@@ -0,0 +1,157 @@
+"""
+EXPLAIN ANALYZE the feed queries with and without the feed indexes
+Run: python -m benchmarks.explain_benchmark --rows 100000 --output explain.json
+
+For each endpoint query the plan is captured twice: once with the partial
+feed indexes dropped inside a rolled-back transaction ("before") and once
+as the schema stands ("after"). Execution times are medians of --runs.
+"""
+import argparse
+import json
+import statistics
+from app import create_app, db
+from app.models import Content
+from benchmarks.seed import get_bench_author, get_bench_categories, seed_large_dataset
+
+FEED_INDEXES = [
+    'ix_content_approved_published',
+    'ix_content_approved_category_published',
+    'ix_content_approved_type_published',
+    'ix_content_approved_views',
+    'ix_content_pending_created',
+    'ix_content_tags',
+    'ix_content_approved_hot',
+    'ix_content_approved_week',
+]
+
+
+def approved():
+    return Content.query.filter_by(status='approved')
+
+
+def count_of(query):
+    """The COUNT(*) Flask-SQLAlchemy's paginate() issues for a query"""
+    return db.select(db.func.count()).select_from(query.order_by(None).subquery())
+
+
+def build_queries(category_ids):
+    """(name, statement) pairs mirroring what each endpoint executes"""
+    newest = approved().order_by(Content.published_at.desc())
+    by_category = approved().filter_by(category_id=category_ids[0])\
+        .order_by(Content.published_at.desc())
+    by_type = approved().filter_by(content_type='video')\
+        .order_by(Content.published_at.desc())
+    deep_page = newest.offset(2000).limit(20)
+
+    # Cursor from the 50th page, as a client paging with ?cursor= would send
+    last = newest.offset(50 * 20).first()
+    cursor_page = approved().filter(
+        db.tuple_(Content.published_at, Content.id) < (last.published_at, last.id)
+    ).order_by(Content.published_at.desc(), Content.id.desc()).limit(21)
+
+    return [
+        ('GET /content', newest.limit(20).statement),
+        ('GET /content (total)', count_of(newest)),
+        ('GET /content?category_id', by_category.limit(20).statement),
+        ('GET /content?content_type', by_type.limit(20).statement),
+        ('GET /content?page=101', deep_page.statement),
+        ('GET /content?cursor', cursor_page.statement),
+        ('GET /content?tags=a,b&tag_match=all',
+         Content.filter_by_tags(approved(), ['security', 'linux'], match='all')
+         .order_by(Content.published_at.desc()).limit(20).statement),
+        ('GET /content?sort=hot',
+         approved().order_by(Content.hot_score.desc(), Content.id.desc()).limit(20).statement),
+        ('GET /content?sort=top_week',
+         approved().filter(Content.week_score.isnot(None))
+         .order_by(Content.week_score.desc(), Content.id.desc()).limit(20).statement),
+        ('GET /recommendations (popular)',
+         approved().order_by(Content.views_count.desc()).limit(10).statement),
+        ('GET /recommendations (subscribed)',
+         approved().filter(Content.category_id.in_(category_ids[:3]))
+         .order_by(Content.published_at.desc()).limit(10).statement),
+        ('GET /admin/content/pending',
+         Content.query.filter_by(status='pending')
+         .order_by(Content.created_at.desc()).limit(20).statement),
+    ]
+
+
+def plan_nodes(plan):
+    """Flatten a JSON plan into 'Node Type [index]' strings"""
+    node = plan['Node Type']
+    if plan.get('Index Name'):
+        node += f" [{plan['Index Name']}]"
+    nodes = [node]
+    for child in plan.get('Plans', []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(connection, statement, runs):
+    """EXPLAIN ANALYZE a statement; median execution ms and the plan"""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+    sql = 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + str(compiled)
+
+    samples = []
+    for _ in range(runs):
+        result = connection.exec_driver_sql(sql, compiled.params).scalar()
+        report = result[0] if isinstance(result, list) else json.loads(result)[0]
+        samples.append(report['Execution Time'])
+
+    return {
+        'execution_ms': round(statistics.median(samples), 3),
+        'plan': plan_nodes(report['Plan'])
+    }
+
+
+def run(runs):
+    """Explain every query without and with the feed indexes"""
+    categories = get_bench_categories(get_bench_author())
+    queries = build_queries([c.id for c in categories])
+    results = []
+    # DROP INDEX waits for every open transaction touching content
+    db.session.rollback()
+
+    with db.engine.connect() as connection:
+        transaction = connection.begin()
+        for name in FEED_INDEXES:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+        before = {name: explain(connection, stmt, runs) for name, stmt in queries}
+        transaction.rollback()
+
+        after = {name: explain(connection, stmt, runs) for name, stmt in queries}
+        connection.rollback()
+
+    print(f"{'query':<34}{'before ms':>12}{'after ms':>12}  plan (after)")
+    print('-' * 100)
+    for name, _ in queries:
+        results.append({'query': name, 'before': before[name], 'after': after[name]})
+        print(f"{name:<34}{before[name]['execution_ms']:>12.2f}{after[name]['execution_ms']:>12.2f}"
+              f"  {' > '.join(after[name]['plan'])}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE the content feed queries')
+    parser.add_argument('--rows', type=int, default=100000, help='Minimum benchmark rows')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per query')
+    parser.add_argument('--output', help='Write before/after timings and plans to this JSON file')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.engine.echo = False
+        existing = Content.query.filter_by(author_id=get_bench_author().id).count()
+        if existing < args.rows:
+            print(f"Seeding {args.rows - existing} content rows...")
+            seed_large_dataset(args.rows - existing)
+            Content.refresh_scores()
+        results = run(args.runs)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
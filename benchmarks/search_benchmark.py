@@ -0,0 +1,78 @@
+"""
+Compare the legacy ILIKE content search with the full-text search path
+Run: python -m benchmarks.search_benchmark --rows 100000
+
+Seeds the benchmark dataset if it holds fewer rows than requested, then times
+the first page and the total count of GET /api/content?search=... for each
+search term under both strategies.
+"""
+import argparse
+import statistics
+import time
+from sqlalchemy import or_
+from app import create_app, db
+from app.models import Content
+from app.utils.search import apply_search
+from benchmarks.seed import get_bench_author, seed_large_dataset
+
+TERMS = ['docker', 'kubernetes deploy', 'contin', 'machine learning model', 'graphql api']
+
+
+def ilike_query(term):
+    """The search query as it was before full-text search"""
+    search_term = f'%{term}%'
+    return Content.query.filter_by(status='approved').filter(
+        or_(
+            Content.title.ilike(search_term),
+            Content.description.ilike(search_term)
+        )
+    ).order_by(Content.published_at.desc())
+
+
+def fts_query(term):
+    """The current full-text search query"""
+    query, rank = apply_search(Content.query.filter_by(status='approved'), term)
+    return query.order_by(rank.desc(), Content.published_at.desc())
+
+
+def time_ms(fn, runs):
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(runs):
+    print(f"{'term':<26}{'strategy':<10}{'page ms':>10}{'count ms':>10}{'matches':>10}")
+    print('-' * 66)
+    for term in TERMS:
+        for name, build in (('ilike', ilike_query), ('fts', fts_query)):
+            query = build(term)
+            page_ms = time_ms(lambda: query.limit(20).all(), runs)
+            count_ms = time_ms(lambda: query.order_by(None).count(), runs)
+            matches = query.order_by(None).count()
+            db.session.expunge_all()
+            print(f"{term:<26}{name:<10}{page_ms:>10.2f}{count_ms:>10.2f}{matches:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark content search strategies')
+    parser.add_argument('--rows', type=int, default=100000, help='Minimum benchmark rows')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per query')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.engine.echo = False
+        existing = Content.query.filter_by(author_id=get_bench_author().id).count()
+        if existing < args.rows:
+            print(f"Seeding {args.rows - existing} content rows...")
+            seed_large_dataset(args.rows - existing)
+        run(args.runs)
+
+
+if __name__ == '__main__':
+    main()
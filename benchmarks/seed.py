@@ -0,0 +1,149 @@
+"""
+Large synthetic dataset for benchmarks
+Run: python -m benchmarks.seed --rows 100000
+
+Rows are owned by a dedicated 'bench_writer' user so they can be removed
+again with --reset without touching real data.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import User, Category, Content
+
+BENCH_USERNAME = 'bench_writer'
+BENCH_CATEGORY_COUNT = 12
+BATCH_SIZE = 5000
+
+VOCABULARY = [
+    'docker', 'kubernetes', 'python', 'flask', 'react', 'javascript', 'deploy',
+    'pipeline', 'continuous', 'integration', 'delivery', 'testing', 'database',
+    'postgres', 'index', 'query', 'cache', 'latency', 'cluster', 'network',
+    'security', 'frontend', 'backend', 'microservice', 'container', 'cloud',
+    'serverless', 'monitoring', 'logging', 'terraform', 'ansible', 'linux',
+    'performance', 'scaling', 'design', 'pattern', 'architecture', 'api',
+    'rest', 'graphql', 'mobile', 'android', 'kotlin', 'swift', 'data',
+    'science', 'machine', 'learning', 'model', 'training', 'career', 'interview'
+]
+
+TAGS = [
+    'devops', 'python', 'javascript', 'cloud', 'security', 'frontend', 'backend',
+    'data', 'mobile', 'career', 'testing', 'databases', 'ai', 'linux'
+]
+
+
+# Pronounceable filler so topic words stay reasonably selective
+_SYLLABLES = ['ka', 'lo', 'mi', 'ter', 'van', 'sor', 'pel', 'dun', 'rix', 'bo', 'nel', 'tas']
+FILLER = sorted({a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES})
+
+
+def _words(rng, count, topic_ratio=1.0):
+    return ' '.join(
+        rng.choice(VOCABULARY) if rng.random() < topic_ratio else rng.choice(FILLER)
+        for _ in range(count)
+    )
+
+
+def get_bench_author():
+    """Get or create the user that owns benchmark rows"""
+    author = User.query.filter_by(username=BENCH_USERNAME).first()
+    if not author:
+        author = User(
+            username=BENCH_USERNAME,
+            email='bench_writer@bench.local',
+            password='bench-password',
+            role='tech_writer'
+        )
+        db.session.add(author)
+        db.session.commit()
+    return author
+
+
+def get_bench_categories(author):
+    """Get or create the categories benchmark rows are spread across"""
+    categories = []
+    for i in range(BENCH_CATEGORY_COUNT):
+        name = f'Bench Category {i}'
+        category = Category.query.filter_by(name=name).first()
+        if not category:
+            category = Category(name=name, description='Benchmark data', created_by=author.id)
+            db.session.add(category)
+        categories.append(category)
+    db.session.commit()
+    return categories
+
+
+def clear_bench_content(author):
+    """Delete all benchmark content"""
+    Content.query.filter_by(author_id=author.id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def seed_large_dataset(rows=100000, seed=42):
+    """
+    Bulk insert synthetic content rows
+
+    Args:
+        rows: Number of content rows to create
+        seed: Random seed so runs are comparable
+
+    Returns:
+        int: Number of rows inserted
+    """
+    rng = random.Random(seed)
+    author = get_bench_author()
+    category_ids = [c.id for c in get_bench_categories(author)]
+    now = datetime.utcnow()
+
+    inserted = 0
+    while inserted < rows:
+        batch = []
+        for _ in range(min(BATCH_SIZE, rows - inserted)):
+            created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 730))
+            roll = rng.random()
+            status = 'approved' if roll < 0.85 else 'pending' if roll < 0.95 else 'flagged'
+            batch.append({
+                'title': _words(rng, rng.randint(3, 8)).title(),
+                'content_type': rng.choice(['article', 'article', 'video', 'audio']),
+                'description': _words(rng, rng.randint(10, 30), topic_ratio=0.1),
+                'body': _words(rng, rng.randint(80, 300), topic_ratio=0.01),
+                'status': status,
+                'tags': rng.sample(TAGS, rng.randint(0, 4)),
+                'author_id': author.id,
+                'category_id': rng.choice(category_ids),
+                'views_count': int(rng.paretovariate(1.2) * 10),
+                'likes_count': rng.randint(0, 200),
+                'dislikes_count': rng.randint(0, 20),
+                'created_at': created_at,
+                'updated_at': created_at,
+                'published_at': created_at + timedelta(hours=2) if status == 'approved' else None
+            })
+        db.session.execute(Content.__table__.insert(), batch)
+        db.session.commit()
+        inserted += len(batch)
+        print(f"  inserted {inserted}/{rows}")
+
+    db.session.execute(db.text('ANALYZE content'))
+    db.session.commit()
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed a large benchmark dataset')
+    parser.add_argument('--rows', type=int, default=100000, help='Content rows to create')
+    parser.add_argument('--reset', action='store_true', help='Remove existing benchmark rows first')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.engine.echo = False
+        if args.reset:
+            print("Removing existing benchmark content...")
+            clear_bench_content(get_bench_author())
+        print(f"Seeding {args.rows} content rows...")
+        seed_large_dataset(args.rows)
+        print("Done!")
+
+
+if __name__ == '__main__':
+    main()
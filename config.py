@@ -16,6 +16,22 @@ class Config:
     
     # Pagination
     POSTS_PER_PAGE = 20
+    CONTENT_BATCH_MAX_IDS = 100  # ids accepted by GET /api/content/batch
+    VIEWER_STATE_MAX_IDS = 500  # ids accepted by GET /api/content/viewer-state
+    
+    # View counts are buffered in memory and written in batches
+    VIEW_COUNT_FLUSH_INTERVAL = 5  # seconds
+    VIEW_COUNT_MAX_PENDING = 1000  # distinct content ids before an early flush
+    
+    # Cache for public responses: 'memory' (per process), 'redis' or 'null'
+    # (production defaults to 'null', see ProductionConfig)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    # Tag counts and facets may lag by the TTL; they keep a per-process cache
+    # even when CACHE_BACKEND is 'null' (None follows CACHE_BACKEND)
+    AGGREGATE_CACHE_BACKEND = os.environ.get('AGGREGATE_CACHE_BACKEND')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = 60  # seconds
+    CACHE_MAX_ENTRIES = 1024
     
     # File Upload
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
@@ -35,11 +51,16 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'postgresql://localhost:5432/moringa_dailydev_test'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    VIEW_COUNT_FLUSH_INTERVAL = 0  # write views through immediately
+    CACHE_BACKEND = 'null'
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    # Several workers each keeping a 'memory' cache serve stale data until the
+    # TTL runs out, so production caches only when a backend is chosen
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'null')
     # Add production-specific settings
 
 config = {
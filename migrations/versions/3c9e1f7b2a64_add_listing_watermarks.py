@@ -0,0 +1,59 @@
+"""Add index-backed watermarks for the listing validators
+
+Revision ID: 3c9e1f7b2a64
+Revises: 00be6ac2e71c
+Create Date: 2026-10-17 20:12:40.518362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7b2a64'
+down_revision = '00be6ac2e71c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scored_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_content_scored_at'), ['scored_at'], unique=False)
+        batch_op.create_index('ix_content_updated', ['updated_at'], unique=False)
+        # Supersedes the single-column foreign key index
+        batch_op.create_index('ix_content_category_updated', ['category_id', 'updated_at'], unique=False)
+        batch_op.drop_index('ix_content_category_id')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION content_category_touch() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND OLD.category_id = NEW.category_id THEN
+                RETURN NULL;
+            END IF;
+            UPDATE categories SET updated_at = clock_timestamp() AT TIME ZONE 'utc'
+            WHERE id IN (
+                CASE WHEN TG_OP <> 'INSERT' THEN OLD.category_id END,
+                CASE WHEN TG_OP <> 'DELETE' THEN NEW.category_id END
+            );
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER content_category_touch_trigger
+        AFTER INSERT OR DELETE OR UPDATE OF category_id ON content
+        FOR EACH ROW EXECUTE FUNCTION content_category_touch()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS content_category_touch_trigger ON content")
+    op.execute("DROP FUNCTION IF EXISTS content_category_touch()")
+
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.create_index('ix_content_category_id', ['category_id'], unique=False)
+        batch_op.drop_index('ix_content_category_updated')
+        batch_op.drop_index('ix_content_updated')
+        batch_op.drop_index(batch_op.f('ix_content_scored_at'))
+        batch_op.drop_column('scored_at')
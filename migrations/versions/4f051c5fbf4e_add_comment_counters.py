@@ -0,0 +1,44 @@
+"""Add denormalized comment counters
+
+Revision ID: 4f051c5fbf4e
+Revises: 70e6405844f0
+Create Date: 2026-10-17 10:03:51.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f051c5fbf4e'
+down_revision = '70e6405844f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('replies_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE content SET comments_count = counts.total
+        FROM (SELECT content_id, count(*) AS total FROM comments GROUP BY content_id) AS counts
+        WHERE counts.content_id = content.id
+    """)
+    op.execute("""
+        UPDATE comments SET replies_count = counts.total
+        FROM (SELECT parent_comment_id, count(*) AS total FROM comments
+              WHERE parent_comment_id IS NOT NULL GROUP BY parent_comment_id) AS counts
+        WHERE counts.parent_comment_id = comments.id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_column('replies_count')
+
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_column('comments_count')
@@ -0,0 +1,69 @@
+"""Add materialized path to comments
+
+Revision ID: 5871c6313b2c
+Revises: a8af4410cf06
+Create Date: 2026-10-17 16:41:52.203817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5871c6313b2c'
+down_revision = 'a8af4410cf06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('path', sa.Text(collation='C'), nullable=True))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION comments_path_insert() RETURNS trigger AS $$
+        BEGIN
+            NEW.path := lpad(NEW.id::text, 10, '0');
+            IF NEW.parent_comment_id IS NOT NULL THEN
+                NEW.path := (SELECT path FROM comments WHERE id = NEW.parent_comment_id) || '.' || NEW.path;
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_path_trigger
+        BEFORE INSERT ON comments
+        FOR EACH ROW EXECUTE FUNCTION comments_path_insert()
+    """)
+
+    # Backfill existing threads top-down
+    op.execute("""
+        WITH RECURSIVE tree AS (
+            SELECT id, lpad(id::text, 10, '0') AS path
+            FROM comments
+            WHERE parent_comment_id IS NULL
+            UNION ALL
+            SELECT comments.id, tree.path || '.' || lpad(comments.id::text, 10, '0')
+            FROM comments
+            JOIN tree ON comments.parent_comment_id = tree.id
+        )
+        UPDATE comments SET path = tree.path
+        FROM tree
+        WHERE comments.id = tree.id
+    """)
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.alter_column('path', existing_type=sa.Text(collation='C'), nullable=False)
+        batch_op.create_index('ix_comments_content_path', ['content_id', 'path'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_content_path')
+
+    op.execute("DROP TRIGGER IF EXISTS comments_path_trigger ON comments")
+    op.execute("DROP FUNCTION IF EXISTS comments_path_insert()")
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_column('path')
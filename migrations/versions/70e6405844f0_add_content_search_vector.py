@@ -0,0 +1,57 @@
+"""Add full-text search vector to content
+
+Revision ID: 70e6405844f0
+Revises: 69fabf7ab2ff
+Create Date: 2026-10-17 09:12:04.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '70e6405844f0'
+down_revision = '69fabf7ab2ff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION content_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C') ||
+                setweight(to_tsvector('english', coalesce(NEW.body, '')), 'D');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER content_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, body, tags ON content
+        FOR EACH ROW EXECUTE FUNCTION content_search_vector_update()
+    """)
+
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE content SET title = title")
+
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.create_index('ix_content_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_index('ix_content_search_vector', postgresql_using='gin')
+
+    op.execute("DROP TRIGGER IF EXISTS content_search_vector_trigger ON content")
+    op.execute("DROP FUNCTION IF EXISTS content_search_vector_update()")
+
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,26 @@
+"""Add GIN index on content tags
+
+Revision ID: a739834cd95a
+Revises: 10d344a8f29a
+Create Date: 2026-10-17 12:41:08.230571
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a739834cd95a'
+down_revision = '10d344a8f29a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.create_index('ix_content_tags', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_index('ix_content_tags', postgresql_using='gin')
@@ -0,0 +1,32 @@
+"""Add indexes for paginated comment threads
+
+Revision ID: a80d8e85c0f6
+Revises: 5871c6313b2c
+Create Date: 2026-10-17 18:05:13.460281
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a80d8e85c0f6'
+down_revision = '5871c6313b2c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_content_root_created', ['content_id', 'created_at', 'id'], unique=False,
+                              postgresql_where=sa.text('parent_comment_id IS NULL'))
+        # Supersedes the single-column foreign key index
+        batch_op.create_index('ix_comments_parent_created', ['parent_comment_id', 'created_at', 'id'], unique=False)
+        batch_op.drop_index('ix_comments_parent_comment_id')
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_parent_comment_id', ['parent_comment_id'], unique=False)
+        batch_op.drop_index('ix_comments_parent_created')
+        batch_op.drop_index('ix_comments_content_root_created')
@@ -0,0 +1,36 @@
+"""Add hot and top-of-the-week ranking scores to content
+
+Revision ID: a8af4410cf06
+Revises: a739834cd95a
+Create Date: 2026-10-17 14:02:51.774310
+
+Scores start at 0/NULL; run `flask refresh-scores` once after upgrading.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8af4410cf06'
+down_revision = 'a739834cd95a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hot_score', sa.Float(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('week_score', sa.Float(), nullable=True))
+        batch_op.create_index('ix_content_approved_hot', ['hot_score', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'approved'"))
+        batch_op.create_index('ix_content_approved_week', ['week_score', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'approved' AND week_score IS NOT NULL"))
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_index('ix_content_approved_week')
+        batch_op.drop_index('ix_content_approved_hot')
+        batch_op.drop_column('week_score')
+        batch_op.drop_column('hot_score')
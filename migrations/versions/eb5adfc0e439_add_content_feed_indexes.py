@@ -0,0 +1,39 @@
+"""Add partial indexes for the content feed
+
+Revision ID: eb5adfc0e439
+Revises: 4f051c5fbf4e
+Create Date: 2026-10-17 11:20:37.655104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eb5adfc0e439'
+down_revision = '4f051c5fbf4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.create_index('ix_content_approved_published', ['published_at', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'approved'"))
+        batch_op.create_index('ix_content_approved_category_published', ['category_id', 'published_at', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'approved'"))
+        batch_op.create_index('ix_content_approved_type_published', ['content_type', 'published_at', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'approved'"))
+        batch_op.create_index('ix_content_approved_views', ['views_count'], unique=False,
+                              postgresql_where=sa.text("status = 'approved'"))
+        batch_op.create_index('ix_content_pending_created', ['created_at', 'id'], unique=False,
+                              postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_index('ix_content_pending_created')
+        batch_op.drop_index('ix_content_approved_views')
+        batch_op.drop_index('ix_content_approved_type_published')
+        batch_op.drop_index('ix_content_approved_category_published')
+        batch_op.drop_index('ix_content_approved_published')
@@ -0,0 +1,39 @@
+"""Cascade deletes to content dependents and comment replies
+
+Revision ID: f2d7a9696d6e
+Revises: a80d8e85c0f6
+Create Date: 2026-10-17 01:39:56.403007
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d7a9696d6e'
+down_revision = 'a80d8e85c0f6'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referred table, constraint name PostgreSQL gave the key)
+CASCADED_KEYS = [
+    ('comments', 'parent_comment_id', 'comments', 'comments_parent_comment_id_fkey'),
+    ('comments', 'content_id', 'content', 'comments_content_id_fkey'),
+    ('content_reviews', 'content_id', 'content', 'content_reviews_content_id_fkey'),
+    ('wishlists', 'content_id', 'content', 'wishlists_content_id_fkey'),
+]
+
+
+def upgrade():
+    for table, column, referred, name in CASCADED_KEYS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    for table, column, referred, name in reversed(CASCADED_KEYS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referred, [column], ['id'])
@@ -422,8 +422,7 @@ def create_reviews(users, contents):
     db.session.commit()
     
     # Update content counts
-    for content in contents:
-        ContentReview.update_content_counts(content.id)
+    ContentReview.recount_all_content_counts()
     
     print(f"Created {len(reviews)} reviews!")
 
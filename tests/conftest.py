@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 from app import create_app, db
 from app.models import User, Category, Content
 
@@ -23,6 +24,33 @@ def runner(app):
     """Create a CLI runner"""
     return app.test_cli_runner()
 
+class QueryCounter:
+    """Count SQL statements executed inside a `with` block"""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self.statements = []
+    
+    def _on_execute(self, conn, cursor, statement, *args, **kwargs):
+        self.count += 1
+        self.statements.append(statement)
+    
+    def __enter__(self):
+        self.count = 0
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+    
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+@pytest.fixture
+def query_counter(app):
+    """Count queries issued while handling requests"""
+    with app.app_context():
+        return QueryCounter(db.engine)
+
 @pytest.fixture
 def admin_user(app):
     """Create an admin user for testing"""
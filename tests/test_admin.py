@@ -59,10 +59,11 @@ class TestAdminFeatures:
         assert data['category']['name'] == 'Frontend'
         assert data['category']['slug'] == 'frontend'
     
-    def test_admin_approve_content(self, client, admin_user, content):
+    def test_admin_approve_content(self, app, client, admin_user, content):
         """Test admin approving content"""
         # Set content to pending first
         from app import db
+        from app.models import Content
         content.status = 'pending'
         db.session.commit()
         
@@ -72,6 +73,14 @@ class TestAdminFeatures:
         assert response.status_code == 200
         data = response.get_json()
         assert data['content']['status'] == 'approved'
+        
+        # Scored on approval, without waiting for flask refresh-scores
+        with app.app_context():
+            approved = db.session.get(Content, content.id)
+            assert approved.hot_score > 0
+            assert approved.week_score is not None
+        titles = [item['title'] for item in client.get('/api/content?sort=top_week').get_json()['content']]
+        assert titles == ['Test Article']
     
     def test_admin_flag_content(self, client, admin_user, content):
         """Test admin flagging content"""
@@ -100,4 +109,73 @@ class TestAdminFeatures:
         assert response.status_code == 200
         data = response.get_json()
         assert 'users' in data
-        assert len(data['users']) >= 3
\ No newline at end of file
+        assert len(data['users']) >= 3
+    
+    def test_flag_content_invalidates_cached_listing(self, app, client, admin_user, content):
+        """Test flagging content drops it from cached public listings"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        
+        assert len(client.get('/api/content').get_json()['content']) == 1
+        assert client.get(f'/api/content/{content.id}').headers['X-Cache'] == 'MISS'
+        assert client.get(f'/api/content/{content.id}').headers['X-Cache'] == 'HIT'
+        
+        headers = get_auth_header(client, 'admin@test.com', 'admin123')
+        client.put(f'/api/admin/content/{content.id}/flag', headers=headers, json={
+            'flag_reason': 'Outdated'
+        })
+        
+        response = client.get('/api/content')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['content'] == []
+        assert client.get(f'/api/content/{content.id}').status_code == 404
+    
+    def test_remove_content_cascades_in_the_database(self, app, client, admin_user, normal_user, content,
+                                                     query_counter):
+        """Test removing content deletes its comments, reviews and wishlists without loading them"""
+        from app import db
+        from app.models import Comment, ContentReview, Wishlist
+        
+        with app.app_context():
+            parent_id = None
+            for i in range(30):
+                comment = Comment(comment_text=f'Comment {i}', content_id=content.id,
+                                  user_id=normal_user.id, parent_comment_id=parent_id if i % 2 else None)
+                db.session.add(comment)
+                db.session.flush()
+                parent_id = comment.id
+            db.session.add(ContentReview(content.id, normal_user.id, 'like'))
+            db.session.add(Wishlist(user_id=normal_user.id, content_id=content.id))
+            db.session.commit()
+        
+        headers = get_auth_header(client, 'admin@test.com', 'admin123')
+        with query_counter:
+            response = client.delete(f'/api/admin/content/{content.id}', headers=headers)
+        assert response.status_code == 200
+        assert not any('FROM comments' in statement for statement in query_counter.statements)
+        
+        with app.app_context():
+            assert Comment.query.count() == 0
+            assert ContentReview.query.count() == 0
+            assert Wishlist.query.count() == 0
+    
+    def test_cache_stats(self, app, client, admin_user, content):
+        """Test admins can read cache hit rates by namespace"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        # Thread pages are only cached on a shared backend
+        app.extensions['cache'].shared = True
+        
+        client.get(f'/api/content/{content.id}/comments')
+        client.get(f'/api/content/{content.id}/comments')
+        
+        headers = get_auth_header(client, 'admin@test.com', 'admin123')
+        response = client.get('/api/admin/cache/stats', headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['backend'] == 'memory'
+        assert data['stats']['comments'] == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
@@ -0,0 +1,79 @@
+import os
+import pytest
+from app import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+# Foreign keys that may stay unindexed: (table, column) -> reason. Only add a
+# column here if no route filters or joins on it and its parent is never
+# deleted in bulk.
+UNINDEXED_FOREIGN_KEYS = {}
+
+
+def leading_indexed_columns(table):
+    """Columns that lead a full (non-partial) index, unique constraint or primary key"""
+    leading = {table.primary_key.columns.values()[0].name}
+
+    for index in table.indexes:
+        if index.dialect_options['postgresql'].get('where') is None:
+            leading.add(index.expressions[0].name)
+
+    for constraint in table.constraints:
+        if isinstance(constraint, db.UniqueConstraint) and constraint.columns:
+            leading.add(constraint.columns.values()[0].name)
+
+    return leading
+
+
+def drop_schema():
+    """Drop the model tables and Alembic's version table"""
+    db.session.rollback()
+    db.drop_all()
+    db.session.execute(db.text('DROP TABLE IF EXISTS alembic_version'))
+    db.session.commit()
+
+
+class TestSchema:
+    """Test schema invariants the query paths rely on"""
+
+    def test_foreign_keys_are_indexed(self, app):
+        """Test every foreign key column can be looked up without a table scan"""
+        missing = []
+
+        for table in db.metadata.sorted_tables:
+            leading = leading_indexed_columns(table)
+            for fk in table.foreign_keys:
+                key = (table.name, fk.parent.name)
+                if fk.parent.name not in leading and key not in UNINDEXED_FOREIGN_KEYS:
+                    missing.append(f'{table.name}.{fk.parent.name}')
+
+        assert not missing, f'Foreign keys without an index: {", ".join(sorted(missing))}'
+
+    def test_migrations_create_the_model_indexes(self, app):
+        """Test a database built by the Alembic migrations has every model index and indexed foreign keys"""
+        from flask_migrate import upgrade
+
+        # The app fixture built the schema from the models; start from nothing instead
+        drop_schema()
+        upgrade(directory=MIGRATIONS_DIR)
+        try:
+            inspector = db.inspect(db.engine)
+            missing = []
+
+            for table in db.metadata.sorted_tables:
+                indexes = inspector.get_indexes(table.name)
+                created = {index['name'] for index in indexes}
+                missing += [f'index {index.name}' for index in table.indexes if index.name not in created]
+
+                leading = {inspector.get_pk_constraint(table.name)['constrained_columns'][0]}
+                leading |= {index['column_names'][0] for index in indexes
+                            if not index.get('dialect_options', {}).get('postgresql_where')}
+                leading |= {unique['column_names'][0] for unique in inspector.get_unique_constraints(table.name)}
+                for fk in inspector.get_foreign_keys(table.name):
+                    column = fk['constrained_columns'][0]
+                    if column not in leading and (table.name, column) not in UNINDEXED_FOREIGN_KEYS:
+                        missing.append(f'foreign key index on {table.name}.{column}')
+
+            assert not missing, f'Missing after migrating: {", ".join(missing)}'
+        finally:
+            drop_schema()
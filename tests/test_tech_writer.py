@@ -0,0 +1,30 @@
+import pytest
+from tests.conftest import get_auth_header
+
+class TestTechWriterFeatures:
+    """Test tech writer-specific features"""
+    
+    def test_writer_review_and_remove_review(self, client, tech_writer, content):
+        """Test writer reviews adjust counters and removal reverts them"""
+        headers = get_auth_header(client, 'writer@test.com', 'writer123')
+        url = f'/api/writer/content/{content.id}/review'
+        
+        response = client.post(url, headers=headers, json={'review_type': 'dislike'})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['content']['dislikes_count'] == 1
+        assert data['content']['likes_count'] == 0
+        
+        response = client.delete(url, headers=headers)
+        
+        assert response.status_code == 200
+        detail = client.get(f'/api/content/{content.id}').get_json()['content']
+        assert detail['dislikes_count'] == 0
+    
+    def test_writer_remove_missing_review(self, client, tech_writer, content):
+        """Test removing a review that does not exist"""
+        headers = get_auth_header(client, 'writer@test.com', 'writer123')
+        response = client.delete(f'/api/writer/content/{content.id}/review', headers=headers)
+        
+        assert response.status_code == 404
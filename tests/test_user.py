@@ -209,4 +209,1003 @@ class TestUserFeatures:
         assert response.status_code == 200
         data = response.get_json()
         assert 'categories' in data
-        assert len(data['categories']) > 0
\ No newline at end of file
+        assert len(data['categories']) > 0
+    
+    def test_get_content_cursor_pagination(self, app, client, content):
+        """Test walking the content feed with keyset cursors"""
+        from datetime import datetime, timedelta
+        from app import db
+        from app.models import Content
+        
+        with app.app_context():
+            for i in range(4):
+                extra = Content(
+                    title=f'Article {i}',
+                    content_type='article',
+                    author_id=content.author_id,
+                    category_id=content.category_id,
+                    status='approved'
+                )
+                extra.published_at = datetime.utcnow() - timedelta(days=i)
+                db.session.add(extra)
+            db.session.commit()
+        
+        response = client.get('/api/content?cursor=&per_page=2')
+        assert response.status_code == 200
+        first_page = response.get_json()
+        assert 'total' not in first_page
+        assert len(first_page['content']) == 2
+        assert first_page['prev_cursor'] is None
+        
+        response = client.get(f"/api/content?cursor={first_page['next_cursor']}&per_page=2")
+        second_page = response.get_json()
+        assert len(second_page['content']) == 2
+        assert second_page['prev_cursor'] is not None
+        
+        seen = [item['id'] for item in first_page['content'] + second_page['content']]
+        assert len(set(seen)) == 4
+        
+        response = client.get(f"/api/content?cursor={second_page['prev_cursor']}&per_page=2")
+        back_page = response.get_json()
+        assert [item['id'] for item in back_page['content']] == \
+            [item['id'] for item in first_page['content']]
+        
+        # Non-positive page sizes fall back to the default, like offset pages
+        for per_page in (-5, 0):
+            response = client.get(f'/api/content?cursor=&per_page={per_page}')
+            assert response.status_code == 200
+            assert len(response.get_json()['content']) == 5
+        
+        from app.utils.pagination import clamp_per_page, MAX_PER_PAGE
+        assert clamp_per_page(10 ** 6) == MAX_PER_PAGE
+    
+    def test_get_content_invalid_cursor(self, client, content):
+        """Test that a malformed cursor is rejected"""
+        response = client.get('/api/content?cursor=not-a-cursor')
+        
+        assert response.status_code == 400
+    
+    def test_search_content_full_text(self, app, client, content):
+        """Test full-text search covers body and ranks title matches first"""
+        from app import db
+        from app.models import Content
+        
+        with app.app_context():
+            body_match = Content(
+                title='Unrelated Title',
+                content_type='article',
+                author_id=content.author_id,
+                category_id=content.category_id,
+                body='Deploying containers with kubernetes',
+                status='approved'
+            )
+            title_match = Content(
+                title='Kubernetes in Production',
+                content_type='article',
+                author_id=content.author_id,
+                category_id=content.category_id,
+                status='approved'
+            )
+            db.session.add_all([body_match, title_match])
+            db.session.commit()
+            title_match_id = title_match.id
+        
+        response = client.get('/api/content?search=kubernet')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['total'] == 2
+        assert data['content'][0]['id'] == title_match_id
+        
+        # Stop words alone make an empty tsquery; fall back to a substring match
+        data = client.get('/api/content?search=in').get_json()
+        assert [item['id'] for item in data['content']] == [title_match_id]
+        data = client.get('/api/content?search=a').get_json()
+        assert content.id in [item['id'] for item in data['content']]
+    
+    def test_content_list_query_count_is_constant(self, app, client, content, query_counter):
+        """Test that listing cost does not grow with page size"""
+        from app import db
+        from app.models import Comment, Content
+        
+        def add_content(count):
+            with app.app_context():
+                for i in range(count):
+                    item = Content(
+                        title=f'Listing {i}',
+                        content_type='article',
+                        author_id=content.author_id,
+                        category_id=content.category_id,
+                        status='approved'
+                    )
+                    db.session.add(item)
+                    db.session.flush()
+                    comment = Comment(comment_text='Nice', content_id=item.id,
+                                      user_id=content.author_id)
+                    db.session.add(comment)
+                    comment.increment_counters()
+                db.session.commit()
+        
+        add_content(1)
+        with query_counter:
+            response = client.get('/api/content?per_page=2')
+        small_page_queries = query_counter.count
+        assert len(response.get_json()['content']) == 2
+        
+        add_content(8)
+        with query_counter:
+            response = client.get('/api/content?per_page=10')
+        assert len(response.get_json()['content']) == 10
+        assert sum(item['comments_count'] for item in response.get_json()['content']) == 9
+        
+        assert query_counter.count == small_page_queries
+    
+    def test_comment_counters_follow_writes(self, client, normal_user, content, query_counter):
+        """Test comments_count and replies_count track creates and subtree deletes"""
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        url = f'/api/content/{content.id}/comments'
+        
+        parent_id = client.post(url, headers=headers, json={
+            'comment_text': 'Parent'
+        }).get_json()['comment']['id']
+        reply_id = client.post(url, headers=headers, json={
+            'comment_text': 'Reply', 'parent_comment_id': parent_id
+        }).get_json()['comment']['id']
+        client.post(url, headers=headers, json={
+            'comment_text': 'Nested reply', 'parent_comment_id': reply_id
+        })
+        
+        data = client.get(url).get_json()
+        assert data['total'] == 3
+        assert data['comments'][0]['replies_count'] == 1
+        
+        with query_counter:
+            client.delete(f'/api/comments/{reply_id}', headers=headers)
+        # The subtree goes in one DELETE, not one per reply
+        assert sum(statement.startswith('DELETE') for statement in query_counter.statements) == 1
+        
+        data = client.get(url).get_json()
+        assert data['total'] == 1
+        assert data['comments'][0]['replies_count'] == 0
+        
+        response = client.get(f'/api/content/{content.id}')
+        assert response.get_json()['content']['comments_count'] == 1
+    
+    def test_recount_comments_command(self, app, runner, normal_user, content):
+        """Test the reconciliation command repairs drifted counters"""
+        from app import db
+        from app.models import Comment, Content
+        
+        with app.app_context():
+            db.session.add(Comment(comment_text='Untracked', content_id=content.id,
+                                   user_id=normal_user.id))
+            db.session.commit()
+        
+        result = runner.invoke(args=['recount-comments'])
+        
+        assert 'Fixed comments_count on 1 content item(s)' in result.output
+        with app.app_context():
+            assert db.session.get(Content, content.id).comments_count == 1
+    
+    def test_comment_thread_loads_in_constant_queries(self, app, client, normal_user, content,
+                                                      query_counter):
+        """Test the threaded comment tree is nested correctly without per-node queries"""
+        from app import db
+        from app.models import Comment
+        
+        def add_chain(length):
+            with app.app_context():
+                parent_id = None
+                for i in range(length):
+                    comment = Comment(comment_text=f'Level {i}', content_id=content.id,
+                                      user_id=normal_user.id, parent_comment_id=parent_id)
+                    db.session.add(comment)
+                    db.session.flush()
+                    parent_id = comment.id
+                db.session.commit()
+        
+        add_chain(1)
+        with query_counter:
+            client.get(f'/api/content/{content.id}/comments')
+        single_comment_queries = query_counter.count
+        
+        add_chain(6)
+        with query_counter:
+            response = client.get(f'/api/content/{content.id}/comments')
+        assert query_counter.count == single_comment_queries
+        
+        comments = response.get_json()['comments']
+        assert len(comments) == 2
+        
+        # Replies stop at max_depth=3, like Comment.to_dict
+        node = comments[0]
+        for level in range(3):
+            assert node['comment_text'] == f'Level {level}'
+            assert len(node['replies']) == 1
+            node = node['replies'][0]
+        assert node['comment_text'] == 'Level 3'
+        assert 'replies' not in node
+    
+    def test_content_detail_counts_views(self, client, content):
+        """Test viewing content detail is counted"""
+        client.get(f'/api/content/{content.id}')
+        response = client.get(f'/api/content/{content.id}')
+        
+        assert response.get_json()['content']['views_count'] == 2
+    
+    def test_view_counter_flushes_in_one_batch(self, app, content, query_counter):
+        """Test buffered views are aggregated and written with one statement"""
+        from app import db
+        from app.models import Content
+        from app.utils.view_counter import ViewCounter
+        
+        app.config['VIEW_COUNT_FLUSH_INTERVAL'] = 3600
+        counter = ViewCounter(app)
+        for _ in range(5):
+            counter.record(content.id)
+        counter.record(content.id + 1000)
+        assert counter.pending(content.id) == 5
+        
+        with query_counter:
+            # The id without a content row is not counted as updated
+            assert counter.flush() == 1
+        assert query_counter.count == 1
+        assert counter.pending(content.id) == 0
+        
+        counter.shutdown()
+        with app.app_context():
+            assert db.session.get(Content, content.id).views_count == 5
+    
+    def test_review_flip_updates_counts(self, client, normal_user, content):
+        """Test switching a like to a dislike moves the counters"""
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        url = f'/api/content/{content.id}/review'
+        
+        client.post(url, headers=headers, json={'review_type': 'like'})
+        client.post(url, headers=headers, json={'review_type': 'like'})
+        data = client.get(f'/api/content/{content.id}').get_json()['content']
+        assert (data['likes_count'], data['dislikes_count']) == (1, 0)
+        
+        client.post(url, headers=headers, json={'review_type': 'dislike'})
+        data = client.get(f'/api/content/{content.id}').get_json()['content']
+        assert (data['likes_count'], data['dislikes_count']) == (0, 1)
+    
+    def test_recount_reviews_command(self, app, runner, normal_user, content):
+        """Test the review recount job repairs drifted counters"""
+        from app import db
+        from app.models import Content, ContentReview
+        
+        with app.app_context():
+            db.session.add(ContentReview(content_id=content.id, user_id=normal_user.id,
+                                         review_type='like'))
+            db.session.commit()
+        
+        result = runner.invoke(args=['recount-reviews'])
+        
+        assert 'Fixed like/dislike counts on 1 content item(s)' in result.output
+        with app.app_context():
+            assert db.session.get(Content, content.id).likes_count == 1
+    
+    def test_review_upsert_reports_previous_type(self, app, normal_user, content):
+        """Test the review upsert returns the type it replaced"""
+        from app import db
+        from app.models import ContentReview
+        
+        with app.app_context():
+            assert ContentReview.upsert(content.id, normal_user.id, 'like') == (None, 'like')
+            assert ContentReview.upsert(content.id, normal_user.id, 'like') == ('like', 'like')
+            assert ContentReview.upsert(content.id, normal_user.id, 'dislike') == ('like', 'dislike')
+            db.session.commit()
+            
+            assert ContentReview.query.filter_by(content_id=content.id).count() == 1
+            assert ContentReview.remove(content.id, normal_user.id) == 'dislike'
+            assert ContentReview.remove(content.id, normal_user.id) is None
+            db.session.commit()
+    
+    def test_public_listing_is_cached_for_anonymous_users(self, app, client, normal_user, content):
+        """Test anonymous reads are served from cache and authenticated ones bypass it"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        
+        assert client.get('/api/content?per_page=5&page=1').headers['X-Cache'] == 'MISS'
+        # Same query args in a different order share the entry
+        assert client.get('/api/content?page=1&per_page=5').headers['X-Cache'] == 'HIT'
+        
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        response = client.get('/api/content?page=1&per_page=5', headers=headers)
+        assert 'X-Cache' not in response.headers
+    
+    def test_cached_listing_body_matches_its_etag(self, app, client, normal_user, category, content):
+        """Test a write that moves the ETag is never answered with the previously cached body"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        
+        etag = client.get('/api/content').headers['ETag']
+        assert client.get('/api/content').headers['X-Cache'] == 'HIT'
+        # A like neither approves nor removes anything, so content-list is not invalidated
+        client.post(f'/api/content/{content.id}/review', headers=headers, json={'review_type': 'like'})
+        
+        response = client.get('/api/content')
+        assert response.headers['ETag'] != etag
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['content'][0]['likes_count'] == 1
+        
+        url = f'/api/categories/{category.id}'
+        assert client.get(url).get_json()['category']['content_count'] == 1
+        client.post('/api/content', headers=headers, json={
+            'title': 'Submitted', 'content_type': 'article', 'category_id': category.id
+        })
+        assert client.get(url).get_json()['category']['content_count'] == 2
+    
+    def test_memory_cache_backend_evicts_and_invalidates(self):
+        """Test the LRU backend evicts the oldest entry and drops tagged keys"""
+        from app.utils.cache import MemoryCacheBackend
+        
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', b'1', 60, tags=['content'])
+        backend.set('b', b'2', 60, tags=['categories'])
+        backend.get('a')
+        backend.set('c', b'3', 60, tags=['content'])
+        
+        assert backend.get('b') is None
+        assert backend.get('a') == b'1'
+        
+        backend.invalidate(['content'])
+        assert backend.get('a') is None
+        assert backend.get('c') is None
+        
+        backend.set('d', b'4', 0)
+        assert backend.get('d') is None
+    
+    def test_content_detail_conditional_get(self, app, client, normal_user, content):
+        """Test a matching ETag gets a 304 that still counts the view"""
+        from app import db
+        from app.models import Content
+        from app.utils.view_counter import view_counter
+        
+        response = client.get(f'/api/content/{content.id}')
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        assert etag.startswith('W/')
+        
+        response = client.get(f'/api/content/{content.id}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        
+        response = client.get(f'/api/content/{content.id}', headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 304
+        
+        view_counter.flush()
+        with app.app_context():
+            assert db.session.get(Content, content.id).views_count == 3
+        
+        # Reviewing the item changes its counters and therefore its validator
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        client.post(f'/api/content/{content.id}/review', json={'review_type': 'like'}, headers=headers)
+        response = client.get(f'/api/content/{content.id}', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    
+    def test_content_listing_conditional_get(self, app, client, tech_writer, content):
+        """Test the listing watermark moves when published content changes"""
+        response = client.get('/api/content')
+        etag = response.headers['ETag']
+        
+        assert client.get('/api/content', headers={'If-None-Match': etag}).status_code == 304
+        
+        headers = get_auth_header(client, 'writer@test.com', 'writer123')
+        client.put(f'/api/writer/content/{content.id}', json={'title': 'Renamed'}, headers=headers)
+        
+        response = client.get('/api/content', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        # Removals do not move max(updated_at), so If-Modified-Since cannot be trusted
+        assert 'Last-Modified' not in response.headers
+        
+        client.delete(f'/api/writer/content/{content.id}', headers=headers)
+        response = client.get('/api/content', headers={'If-None-Match': response.headers['ETag'],
+                                                       'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+        assert response.status_code == 200
+        assert response.get_json()['content'] == []
+    
+    def test_listing_etag_watermarks(self, app, client, normal_user, tech_writer, category, content,
+                                     query_counter):
+        """Test listing validators skip row counts, ignore unrelated users and follow authors and deletes"""
+        from app import db
+        from app.models import Content
+        
+        etag = lambda url='/api/content': client.get(url).headers['ETag']
+        before, category_before = etag(), etag(f'/api/categories/{category.id}')
+        
+        with query_counter:
+            client.get('/api/content', headers={'If-None-Match': before})
+        assert not any('count(content' in sql.lower() or 'FROM users' in sql for sql in query_counter.statements)
+        
+        # A reader registering or editing their profile does not touch any listing
+        client.post('/api/auth/register', json={'username': 'another', 'email': 'another@test.com',
+                                                'password': 'Another123'})
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        client.put('/api/auth/profile', headers=headers, json={'username': 'renamed_reader'})
+        assert etag() == before
+        
+        # The author's name is embedded in every item they wrote
+        headers = get_auth_header(client, 'writer@test.com', 'writer123')
+        client.put('/api/auth/profile', headers=headers, json={'username': 'renamed_writer'})
+        renamed = etag()
+        assert renamed != before
+        assert client.get('/api/content').get_json()['content'][0]['author']['username'] == 'renamed_writer'
+        
+        # A hard delete of an older item moves neither max(updated_at) nor any
+        # remaining row; the category touch moves both validators
+        with app.app_context():
+            db.session.add(Content(title='Newer', content_type='article', author_id=tech_writer.id,
+                                   category_id=category.id, status='approved'))
+            db.session.commit()
+        current, category_current = etag(), etag(f'/api/categories/{category.id}')
+        assert category_current != category_before
+        client.delete(f'/api/writer/content/{content.id}', headers=headers)
+        assert etag() != current
+        assert etag(f'/api/categories/{category.id}') != category_current
+    
+    def test_category_conditional_get(self, client, category):
+        """Test category reads answer If-None-Match and skip missing categories"""
+        response = client.get(f'/api/categories/{category.id}')
+        etag = response.headers['ETag']
+        
+        response = client.get(f'/api/categories/{category.id}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        
+        response = client.get('/api/categories/99999', headers={'If-None-Match': etag})
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+    
+    def test_content_sparse_fieldset(self, client, content, query_counter):
+        """Test fields= returns only the requested fields and selects only their columns"""
+        with query_counter:
+            response = client.get('/api/content?fields=title,author')
+        
+        assert response.status_code == 200
+        item = response.get_json()['content'][0]
+        assert set(item) == {'id', 'title', 'author'}
+        assert item['author']['username'] == 'writer'
+        
+        select = next(sql for sql in query_counter.statements if 'FROM content' in sql and 'LIMIT' in sql)
+        assert 'content.description' not in select
+        assert 'content.body' not in select
+        assert 'categories' not in select
+        
+        response = client.get('/api/content?fields=title,password')
+        assert response.status_code == 400
+        assert 'password' in response.get_json()['error']
+    
+    def test_wishlist_and_recommendations_sparse_fieldset(self, client, normal_user, content):
+        """Test fields= narrows the content nested in wishlist and recommendation items"""
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        client.post('/api/wishlist', json={'content_id': content.id}, headers=headers)
+        
+        response = client.get('/api/wishlist?fields=title,published_at', headers=headers)
+        item = response.get_json()['wishlist'][0]
+        assert set(item['content']) == {'id', 'title', 'published_at'}
+        assert item['content_id'] == content.id
+        
+        response = client.get('/api/recommendations?fields=category', headers=headers)
+        recommendation = response.get_json()['recommendations'][0]
+        assert set(recommendation) == {'id', 'category'}
+        assert recommendation['category']['name'] == 'DevOps'
+    
+    def test_content_tag_filter(self, app, client, tech_writer, category, content):
+        """Test tags= matches any of the tags by default and all with tag_match=all"""
+        from app import db
+        from app.models import Content
+        
+        with app.app_context():
+            db.session.get(Content, content.id).tags = ['python', 'devops']
+            other = Content(title='Docker', content_type='article', author_id=tech_writer.id,
+                            category_id=category.id, status='approved', tags=['devops'])
+            db.session.add(other)
+            db.session.commit()
+        
+        titles = lambda url: {item['title'] for item in client.get(url).get_json()['content']}
+        
+        assert titles('/api/content?tags=python,devops') == {'Test Article', 'Docker'}
+        assert titles('/api/content?tags=python,devops&tag_match=all') == {'Test Article'}
+        assert titles('/api/content?tags=rust') == set()
+        assert client.get('/api/content?tags=python&tag_match=some').status_code == 400
+    
+    def test_tag_counts_are_cached_until_content_changes(self, app, client, admin_user, content):
+        """Test /api/tags serves the cached aggregate and refreshes after moderation"""
+        from app import db
+        from app.models import Content
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        
+        with app.app_context():
+            db.session.get(Content, content.id).tags = ['python', 'devops']
+            db.session.commit()
+        
+        response = client.get('/api/tags')
+        assert response.get_json()['tags'] == [{'tag': 'devops', 'count': 1}, {'tag': 'python', 'count': 1}]
+        assert client.get('/api/tags?limit=1').get_json()['tags'] == [{'tag': 'devops', 'count': 1}]
+        assert client.get('/api/tags?limit=0').status_code == 400
+        assert client.get('/api/tags?limit=-1').status_code == 400
+        
+        # Direct writes bypass invalidation, so the cached aggregate is served
+        with app.app_context():
+            db.session.get(Content, content.id).tags = ['rust']
+            db.session.commit()
+        assert len(client.get('/api/tags').get_json()['tags']) == 2
+        
+        headers = get_auth_header(client, 'admin@test.com', 'admin123')
+        client.put(f'/api/admin/content/{content.id}/flag', json={'flag_reason': 'Spam'}, headers=headers)
+        assert client.get('/api/tags').get_json()['tags'] == []
+    
+    def test_aggregates_stay_cached_without_a_response_cache(self, app, client, content, query_counter):
+        """Test tag counts keep a per-process cache when CACHE_BACKEND is 'null'"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'null'
+        cache.init_app(app)
+        
+        client.get('/api/tags')
+        with query_counter:
+            client.get('/api/tags')
+        assert not any('unnest' in sql for sql in query_counter.statements)
+        assert client.get('/api/content').headers.get('X-Cache') is None
+        
+        app.config['AGGREGATE_CACHE_BACKEND'] = 'null'
+        cache.init_app(app)
+        client.get('/api/tags')
+        with query_counter:
+            client.get('/api/tags')
+        assert any('unnest' in sql for sql in query_counter.statements)
+    
+    def test_content_facets(self, app, client, tech_writer, category, content, query_counter):
+        """Test facet counts for the current filters come from one grouped query"""
+        from app import db
+        from app.models import Content
+        
+        with app.app_context():
+            db.session.get(Content, content.id).tags = ['python', 'devops']
+            db.session.add_all([
+                Content(title='Docker Video', content_type='video', author_id=tech_writer.id,
+                        category_id=category.id, status='approved', tags=['devops', 'devops']),
+                Content(title='Draft', content_type='video', author_id=tech_writer.id,
+                        category_id=category.id, status='pending', tags=['devops'])
+            ])
+            db.session.commit()
+        
+        with query_counter:
+            response = client.get('/api/content/facets')
+        assert query_counter.count == 1
+        
+        facets = response.get_json()['facets']
+        assert facets['total'] == 2
+        assert facets['categories'] == [{'id': category.id, 'name': 'DevOps', 'slug': 'devops', 'count': 2}]
+        assert facets['content_types'] == [{'content_type': 'article', 'count': 1},
+                                           {'content_type': 'video', 'count': 1}]
+        assert facets['tags'] == [{'tag': 'devops', 'count': 2}, {'tag': 'python', 'count': 1}]
+        
+        facets = client.get('/api/content/facets?tags=python&content_type=article').get_json()['facets']
+        assert facets['total'] == 1
+        assert facets['tags'] == [{'tag': 'devops', 'count': 1}, {'tag': 'python', 'count': 1}]
+    
+    def test_content_facets_cached_per_normalized_filter(self, app, client, admin_user, content):
+        """Test equivalent filters share a cache entry that moderation invalidates"""
+        import json
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        
+        first = client.get('/api/content/facets?tags=b,a&search=Test%20%20Article').get_json()
+        assert first['filters']['tags'] == ['a', 'b']
+        assert first['filters']['search'] == 'test article'
+        assert cache.get('facets:' + json.dumps(first['filters'], sort_keys=True)) is not None
+        
+        facets = client.get('/api/content/facets').get_json()['facets']
+        assert facets['total'] == 1
+        
+        headers = get_auth_header(client, 'admin@test.com', 'admin123')
+        client.put(f'/api/admin/content/{content.id}/flag', json={'flag_reason': 'Spam'}, headers=headers)
+        assert client.get('/api/content/facets').get_json()['facets']['total'] == 0
+    
+    def test_content_hot_and_top_week_sorts(self, app, client, runner, tech_writer, category, content):
+        """Test refreshed scores rank the hot and top_week feeds"""
+        from datetime import datetime, timedelta
+        from app import db
+        from app.models import Content
+        
+        now = datetime.utcnow()
+        with app.app_context():
+            fresh = Content(title='Fresh', content_type='article', author_id=tech_writer.id,
+                            category_id=category.id, status='approved', likes_count=5)
+            popular = Content(title='Popular', content_type='article', author_id=tech_writer.id,
+                              category_id=category.id, status='approved', likes_count=5000)
+            old = Content(title='Old', content_type='article', author_id=tech_writer.id,
+                          category_id=category.id, status='approved', likes_count=100)
+            db.session.add_all([fresh, popular, old])
+            db.session.flush()
+            db.session.get(Content, content.id).published_at = now - timedelta(hours=1)
+            fresh.published_at = now
+            popular.published_at = now - timedelta(days=1)
+            old.published_at = now - timedelta(days=30)
+            db.session.commit()
+        
+        result = runner.invoke(args=['refresh-scores'])
+        assert 'Updated scores on 4 content item(s)' in result.output
+        # Nothing changed since, so nothing is rewritten
+        assert 'Updated scores on 0 content item(s)' in runner.invoke(args=['refresh-scores']).output
+        
+        titles = lambda url: [item['title'] for item in client.get(url).get_json()['content']]
+        
+        # Three orders of magnitude more likes outweigh a day of recency
+        assert titles('/api/content?sort=hot') == ['Popular', 'Fresh', 'Test Article', 'Old']
+        assert titles('/api/content?sort=top_week') == ['Popular', 'Fresh', 'Test Article']
+        assert titles('/api/content?sort=new') == ['Fresh', 'Test Article', 'Popular', 'Old']
+        assert titles('/api/content?sort=hot&cursor=&per_page=2') == ['Popular', 'Fresh']
+        assert client.get('/api/content?sort=best').status_code == 400
+    
+    def test_hot_feed_etag_changes_when_scores_refresh(self, app, client, runner, content):
+        """Test a re-ranking by the score job is not hidden behind a 304"""
+        from app import db
+        from app.models import Content
+        
+        runner.invoke(args=['refresh-scores'])
+        etag = client.get('/api/content?sort=hot').headers['ETag']
+        
+        with app.app_context():
+            # Views move the score without touching updated_at
+            db.session.query(Content).filter_by(id=content.id).update(
+                {Content.views_count: 10000, Content.updated_at: Content.updated_at})
+            db.session.commit()
+        assert client.get('/api/content?sort=hot', headers={'If-None-Match': etag}).status_code == 304
+        
+        runner.invoke(args=['refresh-scores'])
+        assert client.get('/api/content?sort=hot', headers={'If-None-Match': etag}).status_code == 200
+    
+    def test_content_listing_count_modes(self, app, client, tech_writer, category, content, monkeypatch):
+        """Test count=estimate caps the exact count and count=none skips it"""
+        from app import db
+        from app.models import Content
+        from app.utils import pagination
+        
+        with app.app_context():
+            for i in range(4):
+                db.session.add(Content(title=f'Extra {i}', content_type='article', author_id=tech_writer.id,
+                                       category_id=category.id, status='approved'))
+            db.session.commit()
+        
+        data = client.get('/api/content?per_page=2').get_json()
+        assert (data['total'], data['total_exact'], data['pages'], data['has_next']) == (5, True, 3, True)
+        
+        monkeypatch.setattr(pagination, 'ESTIMATE_EXACT_UP_TO', 10)
+        data = client.get('/api/content?per_page=2&count=estimate').get_json()
+        assert (data['total'], data['total_exact']) == (5, True)
+        
+        monkeypatch.setattr(pagination, 'ESTIMATE_EXACT_UP_TO', 3)
+        data = client.get('/api/content?per_page=2&count=estimate').get_json()
+        assert data['total_exact'] is False
+        assert data['total'] >= 4
+        
+        data = client.get('/api/content?per_page=2&page=3&count=none').get_json()
+        assert (data['total'], data['pages'], data['has_next']) == (None, None, False)
+        assert len(data['content']) == 1
+        
+        assert client.get('/api/content?count=approx').status_code == 400
+    
+    def test_content_batch(self, app, client, tech_writer, category, content, query_counter):
+        """Test the batch endpoint keeps request order, marks missing ids and counts no views"""
+        from app import db
+        from app.models import Content
+        
+        with app.app_context():
+            other = Content(title='Other', content_type='video', author_id=tech_writer.id,
+                            category_id=category.id, status='approved')
+            pending = Content(title='Pending', content_type='video', author_id=tech_writer.id,
+                              category_id=category.id, status='pending')
+            db.session.add_all([other, pending])
+            db.session.commit()
+            other_id, pending_id = other.id, pending.id
+        
+        with query_counter:
+            response = client.get(f'/api/content/batch?ids={other_id},999,{content.id},{pending_id},{other_id}')
+        assert response.status_code == 200
+        assert query_counter.count == 1
+        
+        items = response.get_json()['content']
+        assert [item['id'] for item in items] == [other_id, 999, content.id, pending_id]
+        assert items[0]['title'] == 'Other'
+        assert items[0]['author']['username'] == 'writer'
+        assert items[1] == {'id': 999, 'error': 'Content not found'}
+        assert items[3]['error'] == 'Content not found'
+        
+        with app.app_context():
+            assert db.session.get(Content, content.id).views_count == 0
+        
+        items = client.get(f'/api/content/batch?ids={content.id}&fields=title').get_json()['content']
+        assert items == [{'id': content.id, 'title': 'Test Article'}]
+        
+        app.config['CONTENT_BATCH_MAX_IDS'] = 2
+        assert client.get('/api/content/batch?ids=1,2,3').status_code == 400
+        assert client.get('/api/content/batch?ids=1,abc').status_code == 400
+        assert client.get('/api/content/batch').status_code == 400
+        # Non-ASCII digits and ids outside the int4 range are rejected, not passed on
+        assert client.get('/api/content/batch?ids=\u00b2').status_code == 400
+        assert client.get('/api/content/batch?ids=2147483648').status_code == 400
+        assert client.get('/api/content/batch?ids=0').status_code == 400
+    
+    def test_content_page(self, app, client, normal_user, content, query_counter):
+        """Test the content page bundles detail, comments and viewer state in fixed queries"""
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        
+        root_id = client.post(f'/api/content/{content.id}/comments', headers=headers,
+                              json={'comment_text': 'Root'}).get_json()['comment']['id']
+        client.post(f'/api/content/{content.id}/comments', headers=headers,
+                    json={'comment_text': 'Reply', 'parent_comment_id': root_id})
+        client.post(f'/api/content/{content.id}/review', headers=headers, json={'review_type': 'like'})
+        wishlist_id = client.post('/api/wishlist', headers=headers,
+                                  json={'content_id': content.id}).get_json()['wishlist']['id']
+        
+        with query_counter:
+            response = client.get(f'/api/content/{content.id}/page', headers=headers)
+        assert response.status_code == 200
+        queries = query_counter.count
+        
+        data = response.get_json()
+        assert data['content']['body'] == 'Test body content'
+        assert data['comments_total'] == 2
+        assert data['has_more_comments'] is False
+        assert data['comments'][0]['comment_text'] == 'Root'
+        assert data['comments'][0]['replies'][0]['comment_text'] == 'Reply'
+        assert data['viewer'] == {'review_type': 'like', 'in_wishlist': True, 'wishlist_id': wishlist_id}
+        
+        # More comments and replies do not add queries
+        for i in range(5):
+            parent_id = client.post(f'/api/content/{content.id}/comments', headers=headers,
+                                    json={'comment_text': f'Root {i}'}).get_json()['comment']['id']
+            client.post(f'/api/content/{content.id}/comments', headers=headers,
+                        json={'comment_text': f'Reply {i}', 'parent_comment_id': parent_id})
+        
+        with query_counter:
+            response = client.get(f'/api/content/{content.id}/page?comments_per_page=4', headers=headers)
+        assert query_counter.count == queries
+        assert len(response.get_json()['comments']) == 4
+        assert response.get_json()['has_more_comments'] is True
+        
+        response = client.get(f'/api/content/{content.id}/page')
+        assert response.status_code == 200
+        assert response.get_json()['viewer'] is None
+        
+        assert client.get('/api/content/999/page').status_code == 404
+    
+    def test_viewer_state(self, app, client, normal_user, content, query_counter):
+        """Test bulk viewer state uses two queries, is cached only when shared and refreshes on writes"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        url = f'/api/content/viewer-state?ids=999,{content.id}'
+        
+        with query_counter:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        # User fetch by active_user_required, then one query per table
+        assert query_counter.count == 3
+        assert response.get_json()['states'] == [
+            {'content_id': 999, 'review_type': None, 'in_wishlist': False, 'wishlist_id': None},
+            {'content_id': content.id, 'review_type': None, 'in_wishlist': False, 'wishlist_id': None}
+        ]
+        
+        # A per-process cache is not read-your-writes across workers
+        with query_counter:
+            client.get(url, headers=headers)
+        assert query_counter.count == 3
+        
+        # Stand in for a shared backend such as Redis
+        app.extensions['cache'].shared = True
+        client.get(url, headers=headers)
+        with query_counter:
+            client.get(url, headers=headers)
+        assert query_counter.count == 1
+        
+        client.post(f'/api/content/{content.id}/review', headers=headers, json={'review_type': 'dislike'})
+        wishlist_id = client.post('/api/wishlist', headers=headers,
+                                  json={'content_id': content.id}).get_json()['wishlist']['id']
+        state = client.get(url, headers=headers).get_json()['states'][1]
+        assert state == {'content_id': content.id, 'review_type': 'dislike',
+                         'in_wishlist': True, 'wishlist_id': wishlist_id}
+        
+        client.delete(f'/api/wishlist/{wishlist_id}', headers=headers)
+        assert client.get(url, headers=headers).get_json()['states'][1]['in_wishlist'] is False
+        
+        assert client.get('/api/content/viewer-state?ids=1').status_code == 401
+        assert client.get('/api/content/viewer-state?ids=\u00b2', headers=headers).status_code == 400
+        assert client.get('/api/content/viewer-state?ids=99999999999', headers=headers).status_code == 400
+        app.config['VIEWER_STATE_MAX_IDS'] = 1
+        assert client.get(url, headers=headers).status_code == 400
+    
+    def test_comment_paths_support_subtree_range_scans(self, app, normal_user, content, query_counter):
+        """Test comment paths are set on insert and subtree reads are single queries"""
+        from app import db
+        from app.models import Comment
+        
+        with app.app_context():
+            def add(text, parent=None):
+                comment = Comment(comment_text=text, content_id=content.id, user_id=normal_user.id,
+                                  parent_comment_id=parent.id if parent else None)
+                db.session.add(comment)
+                db.session.commit()
+                return comment
+            
+            root = add('root')
+            child = add('child', root)
+            grandchild = add('grandchild', child)
+            sibling = add('sibling', root)
+            other = add('other root')
+            
+            assert root.path == f'{root.id:010d}'
+            assert grandchild.path == f'{root.id:010d}.{child.id:010d}.{grandchild.id:010d}'
+            assert (root.depth, child.depth, grandchild.depth) == (0, 1, 2)
+            
+            with query_counter:
+                replies = root.get_all_replies_recursive()
+                texts = [reply.comment_text for reply in replies]
+            assert query_counter.count == 1
+            assert texts == ['child', 'grandchild', 'sibling']
+            
+            assert [c.id for c in root.descendants(max_depth=1)] == [child.id, sibling.id]
+            assert sorted(root.get_subtree_ids()) == sorted([root.id, child.id, grandchild.id, sibling.id])
+            assert other.get_subtree_ids() == [other.id]
+    
+    def test_comment_thread_pages_and_branch_cursors(self, app, client, normal_user, content, query_counter):
+        """Test top-level comments page by cursor and capped branches continue via replies_cursor"""
+        from app import db
+        from app.models import Comment
+        
+        with app.app_context():
+            def add(text, parent_id=None):
+                comment = Comment(comment_text=text, content_id=content.id, user_id=normal_user.id,
+                                  parent_comment_id=parent_id)
+                db.session.add(comment)
+                comment.increment_counters()
+                db.session.flush()
+                return comment.id
+            
+            for i in range(4):
+                add(f'Root {i}')
+            busy_id = add('Busy root')
+            for i in range(5):
+                reply_id = add(f'Reply {i}', busy_id)
+            for i in range(3):
+                add(f'Nested {i}', reply_id)
+            db.session.commit()
+        
+        with query_counter:
+            response = client.get(f'/api/content/{content.id}/comments?per_page=2&replies_per_parent=2')
+        assert response.status_code == 200
+        # Content, top-level page, reply branches
+        assert query_counter.count == 3
+        
+        data = response.get_json()
+        assert [c['comment_text'] for c in data['comments']] == ['Busy root', 'Root 3']
+        busy = data['comments'][0]
+        assert [r['comment_text'] for r in busy['replies']] == ['Reply 4', 'Reply 3']
+        assert busy['replies'][0]['replies'][0]['comment_text'] == 'Nested 2'
+        assert busy['replies'][0]['replies_cursor'] is not None
+        assert data['comments'][1]['replies_cursor'] is None
+        
+        response = client.get(f"/api/content/{content.id}/comments?per_page=2&cursor={data['next_cursor']}")
+        assert [c['comment_text'] for c in response.get_json()['comments']] == ['Root 2', 'Root 1']
+        
+        response = client.get(f"/api/comments/{busy['id']}/replies?per_page=2&cursor={busy['replies_cursor']}")
+        page = response.get_json()
+        assert [r['comment_text'] for r in page['replies']] == ['Reply 2', 'Reply 1']
+        assert page['next_cursor'] is not None
+        assert page['total'] == 5
+        
+        assert client.get(f'/api/content/{content.id}/comments?cursor=bogus').status_code == 400
+        assert client.get(f'/api/content/{content.id}/comments?replies_per_parent=0').status_code == 400
+        assert client.get('/api/comments/999/replies').status_code == 404
+    
+    def test_comment_thread_is_cached_until_comments_change(self, app, client, normal_user, content,
+                                                            query_counter):
+        """Test thread pages are served from a shared cache, counted, and dropped on comment writes"""
+        from app.utils.cache import cache
+        
+        app.config['CACHE_BACKEND'] = 'memory'
+        cache.init_app(app)
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        url = f'/api/content/{content.id}/comments'
+        
+        # A per-process cache would hide a new comment from workers that did not write it
+        client.get(url)
+        with app.app_context():
+            assert 'comments' not in cache.stats.snapshot()
+        
+        # Stand in for a shared backend such as Redis
+        app.extensions['cache'].shared = True
+        comment_id = client.post(url, headers=headers, json={'comment_text': 'First'}).get_json()['comment']['id']
+        assert client.get(url).get_json()['comments'][0]['comment_text'] == 'First'
+        
+        with query_counter:
+            client.get(url)
+        # Only the content lookup; the thread comes from cache
+        assert query_counter.count == 1
+        
+        client.put(f'/api/comments/{comment_id}', headers=headers, json={'comment_text': 'Edited'})
+        assert client.get(url).get_json()['comments'][0]['comment_text'] == 'Edited'
+        
+        client.post(url, headers=headers, json={'comment_text': 'Reply', 'parent_comment_id': comment_id})
+        assert client.get(url).get_json()['comments'][0]['replies'][0]['comment_text'] == 'Reply'
+        
+        client.delete(f'/api/comments/{comment_id}', headers=headers)
+        assert client.get(url).get_json()['comments'] == []
+        
+        with app.app_context():
+            stats = cache.stats.snapshot()['comments']
+        assert stats == {'hits': 1, 'misses': 4, 'hit_rate': 0.2}
+    
+    def test_recommendations_blend_item_neighbors(self, app, client, runner, normal_user, tech_writer,
+                                                  category, content, query_counter):
+        """Test neighbors built from likes and wishlists lead the recommendations"""
+        from app import db
+        from app.models import Content, ContentReview, ContentNeighbor, User, Wishlist
+        
+        with app.app_context():
+            items = {}
+            for title in ('X', 'Y', 'Z'):
+                item = Content(title=title, content_type='article', author_id=tech_writer.id,
+                               category_id=category.id, status='approved')
+                db.session.add(item)
+                items[title] = item
+            readers = [User(username=f'reader{i}', email=f'reader{i}@test.com', password='reader123')
+                       for i in range(4)]
+            db.session.add_all(readers)
+            db.session.flush()
+            
+            # X and Y share three readers, X and Z two, Y and Z only one
+            for reader, liked in zip(readers, ('XY', 'XY', 'XZ', 'XY')):
+                for title in liked:
+                    db.session.add(ContentReview(items[title].id, reader.id, 'like'))
+            db.session.add(Wishlist(user_id=readers[1].id, content_id=items['Z'].id))
+            db.session.add(ContentReview(items['X'].id, normal_user.id, 'like'))
+            db.session.commit()
+            ids = {title: item.id for title, item in items.items()}
+        
+        result = runner.invoke(args=['build-recommendations'])
+        assert 'Stored 4 neighbor pair(s)' in result.output
+        
+        assert runner.invoke(args=['build-recommendations', '--neighbors', '0']).exit_code == 2
+        assert runner.invoke(args=['build-recommendations', '--min-co-users', '-1']).exit_code == 2
+        result = runner.invoke(args=['build-recommendations', '--neighbors', '1'])
+        assert 'Stored 3 neighbor pair(s)' in result.output
+        runner.invoke(args=['build-recommendations'])
+        
+        with app.app_context():
+            neighbors = {(n.content_id, n.neighbor_id): n.score for n in ContentNeighbor.query.all()}
+        # Cosine similarity; X has five readers counting the user below
+        assert neighbors[(ids['X'], ids['Y'])] == pytest.approx(3 / (5 * 3) ** 0.5)
+        assert neighbors[(ids['X'], ids['Z'])] == pytest.approx(2 / (5 * 2) ** 0.5)
+        assert (ids['Y'], ids['Z']) not in neighbors
+        
+        headers = get_auth_header(client, 'user@test.com', 'user123')
+        with query_counter:
+            response = client.get('/api/recommendations?limit=2', headers=headers)
+        # User check, then one query for the neighbor-based items
+        assert query_counter.count == 2
+        assert [item['id'] for item in response.get_json()['recommendations']] == [ids['Y'], ids['Z']]
+        
+        # Short lists are filled from popular content
+        response = client.get('/api/recommendations?limit=4', headers=headers)
+        recommended = [item['id'] for item in response.get_json()['recommendations']]
+        assert recommended[:2] == [ids['Y'], ids['Z']]
+        assert len(recommended) == 4 and len(set(recommended)) == 4